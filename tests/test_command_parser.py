@@ -78,6 +78,11 @@ class TestCommandParser:
         assert command_type == "error"
         assert "Unknown device: unknown" in params["message"]
 
+    @patch("waterbot.utils.command_parser.DEVICE_TO_PIN", {"pump": 17})
+    def test_schedule_add_requires_singular_keyword(self):
+        """Test that only "schedule" adds entries; "schedules" with arguments is not a command."""
+        assert parse_command("schedules pump on 08:00") == ("help", {})
+
     @patch("waterbot.utils.command_parser.DEVICE_TO_PIN", {"pump": 17})
     def test_schedule_remove_command(self):
         """Test parsing schedule remove commands."""
@@ -113,6 +118,14 @@ class TestCommandParser:
         assert command_type == "all_on"
         assert params["timeout"] == 600  # 10 minutes * 60 seconds
 
+    def test_fixed_command_params_are_copies(self):
+        """Test that mutating returned params does not affect later parses."""
+        _, params = parse_command("on all")
+        params["timeout"] = 1
+
+        _, params = parse_command("on all")
+        assert params["timeout"] == 600
+
     @patch("waterbot.utils.command_parser.DEVICE_TO_PIN", {"pump": 17, "light": 18})
     def test_device_on_command(self):
         """Test parsing device on commands."""
@@ -175,6 +188,14 @@ class TestCommandParser:
         assert command_type == "help"
         assert params == {}
 
+    def test_non_command_first_word(self):
+        """Test that input not starting with a command keyword returns help."""
+        for text in ["", "   ", "hello there", "onward pump", "statuses"]:
+            command_type, params = parse_command(text)
+
+            assert command_type == "help"
+            assert params == {}
+
     def test_case_insensitive_parsing(self):
         """Test that command parsing is case insensitive."""
         with patch("waterbot.utils.command_parser.DEVICE_TO_PIN", {"pump": 17}):
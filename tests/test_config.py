@@ -11,6 +11,7 @@ from waterbot.config import (
     get_schedules,
     load_schedules,
     remove_schedule,
+    replace_schedules,
     save_schedules,
 )
 
@@ -109,6 +110,33 @@ class TestScheduleConfiguration:
             # Device should be completely removed
             assert "pump" not in DEVICE_SCHEDULES
 
+    def test_replace_schedules(self):
+        """Test replacing all schedules of a device with a single save."""
+        with patch("waterbot.config.DEVICE_TO_PIN", {"pump": 17}):
+            add_schedule("pump", "on", "08:00")
+            add_schedule("pump", "off", "08:05")
+
+            with patch("waterbot.config.save_schedules", return_value=True) as mock_save:
+                removed, added = replace_schedules(
+                    "pump", [("on", "21:00"), ("off", "21:05"), ("on", "6:00"), ("on", "21:00")]
+                )
+
+            assert removed == 2
+            assert added == [("on", "21:00"), ("off", "21:05")]
+            assert DEVICE_SCHEDULES["pump"] == {"on": ["21:00"], "off": ["21:05"]}
+            mock_save.assert_called_once()
+
+    def test_replace_schedules_empty_clears_device(self):
+        """Test that replacing with no entries removes the device."""
+        with patch("waterbot.config.DEVICE_TO_PIN", {"pump": 17}):
+            add_schedule("pump", "on", "08:00")
+
+            removed, added = replace_schedules("pump", [])
+
+            assert removed == 1
+            assert added == []
+            assert "pump" not in DEVICE_SCHEDULES
+
     def test_get_schedules_all(self):
         """Test getting all schedules."""
         with patch("waterbot.config.DEVICE_TO_PIN", {"pump": 17, "light": 18}):
@@ -241,3 +269,14 @@ class TestScheduleConfiguration:
 
                     # Should not create any schedules due to invalid formats
                     assert "pump" not in DEVICE_SCHEDULES
+
+    def test_load_schedules_missing_file(self):
+        """Test loading schedules when the config file does not exist."""
+        import waterbot.config as config
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            missing_file = os.path.join(temp_dir, "missing.json")
+            with patch("waterbot.config.SCHEDULE_CONFIG_FILE", missing_file):
+                load_schedules()
+
+        assert config.DEVICE_SCHEDULES == {}
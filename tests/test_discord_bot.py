@@ -1,10 +1,20 @@
 """Test cases for WaterBot Discord integration."""
 
+import asyncio
+import threading
+import time
+from types import MappingProxyType
 from unittest.mock import AsyncMock, Mock, PropertyMock, patch
 
 import pytest
 
-from waterbot.discord.bot import WaterBot, get_bot_instance, set_bot_instance
+from waterbot.discord.bot import (
+    WaterBot,
+    _parse_command_cached,
+    get_bot_instance,
+    set_bot_instance,
+    split_message,
+)
 
 
 class TestWaterBot:
@@ -26,6 +36,10 @@ class TestWaterBot:
         self.config_token_patcher.stop()
         self.config_channel_patcher.stop()
 
+    async def _wait_for_message_tasks(self):
+        """Wait for message handling tasks scheduled by on_message."""
+        await asyncio.gather(*self.bot._inflight)
+
     def test_bot_initialization(self):
         """Test bot initialization."""
         assert self.bot.channel_id == 123456789
@@ -85,10 +99,72 @@ class TestWaterBot:
                     mock_execute.return_value = "Test response"
 
                     await self.bot.on_message(mock_message)
+                    await self._wait_for_message_tasks()
 
                     mock_execute.assert_called_once()
                     mock_message.channel.send.assert_called_once_with("Test response")
 
+    @pytest.mark.asyncio
+    async def test_on_message_slow_message_does_not_block_next(self):
+        """Test that a command is handled while an earlier message is still being processed."""
+        handled = []
+        release_slow = asyncio.Event()
+
+        async def fake_handle(message):
+            if message.content == "slow":
+                await release_slow.wait()
+            handled.append(message.content)
+
+        messages = []
+        for content in ("slow", "off all"):
+            mock_message = Mock()
+            mock_message.content = content
+            mock_message.channel.id = 123456789
+            messages.append(mock_message)
+
+        with patch.object(type(self.bot), "user", new_callable=PropertyMock) as mock_user_prop:
+            mock_user_prop.return_value = Mock()
+            with patch.object(self.bot, "_handle_message", side_effect=fake_handle):
+                for mock_message in messages:
+                    await self.bot.on_message(mock_message)
+
+                for _ in range(3):
+                    await asyncio.sleep(0)
+                assert handled == ["off all"]
+
+                release_slow.set()
+                await self._wait_for_message_tasks()
+
+        assert handled == ["off all", "slow"]
+        assert self.bot._inflight == set()
+
+    @pytest.mark.asyncio
+    async def test_close_cancels_inflight_messages(self):
+        """Test that closing the bot cancels message handlers still in flight."""
+        started = asyncio.Event()
+
+        async def fake_handle(message):
+            started.set()
+            await asyncio.Event().wait()
+
+        mock_message = Mock()
+        mock_message.content = "status"
+        mock_message.channel.id = 123456789
+
+        with patch.object(type(self.bot), "user", new_callable=PropertyMock) as mock_user_prop:
+            mock_user_prop.return_value = Mock()
+            with patch.object(self.bot, "_handle_message", side_effect=fake_handle):
+                await self.bot.on_message(mock_message)
+                await started.wait()
+                (task,) = self.bot._inflight
+
+                with patch("discord.ext.commands.Bot.close", new_callable=AsyncMock) as mock_close:
+                    await self.bot.close()
+
+        assert task.cancelled()
+        assert self.bot._inflight == set()
+        mock_close.assert_awaited_once()
+
     @pytest.mark.asyncio
     async def test_on_message_ignore_bot(self):
         """Test ignoring messages from bot itself."""
@@ -347,6 +423,15 @@ class TestWaterBot:
         assert "Unknown command" in response
         assert "help" in response
 
+    @pytest.mark.asyncio
+    async def test_execute_command_time(self):
+        """Test that the time command reports the system timezone."""
+        with patch("waterbot.discord.bot.get_timezone_name", return_value="Europe/Berlin"):
+            response = await self.bot._execute_command("time", {})
+
+        assert response is not None and "Current Time:" in response
+        assert "Timezone:** Europe/Berlin" in response
+
     def test_get_help_response(self):
         """Test get help response."""
         response = self.bot._get_help_response()
@@ -367,6 +452,17 @@ class TestWaterBot:
             assert "pump: ON" in response
             assert "light: OFF" in response
 
+    def test_get_status_response_reuses_text_for_same_snapshot(self):
+        """Test that the status text is only rebuilt when the status snapshot changes."""
+        snapshot = MappingProxyType({"pump": True})
+        with patch("waterbot.discord.bot.gpio_handler.get_status") as mock_get_status:
+            mock_get_status.return_value = snapshot
+            first = self.bot._get_status_response()
+            assert self.bot._get_status_response() is first
+
+            mock_get_status.return_value = MappingProxyType({"pump": False})
+            assert "pump: OFF" in self.bot._get_status_response()
+
     def test_get_status_response_empty(self):
         """Test get status response with no devices."""
         with patch("waterbot.discord.bot.gpio_handler.get_status") as mock_get_status:
@@ -399,8 +495,28 @@ class TestWaterBot:
                 assert "PUMP:" in response
                 assert "ON at 08:00" in response
                 assert "OFF at 20:00" in response
+                assert "ON at 08:00 (next: 2024-01-01 08:00:00)" in response
                 assert "Next scheduled runs:" in response
 
+    def test_get_device_schedules_response(self):
+        """Test device schedules response shows next runs inline."""
+        mock_next_runs = [
+            {"device": "pump", "action": "on", "time": "08:00", "next_run": "2024-01-01 08:00:00"},
+            {"device": "light", "action": "on", "time": "07:00", "next_run": "2024-01-01 07:00:00"},
+        ]
+
+        with patch("waterbot.discord.bot.get_schedules") as mock_get_schedules:
+            with patch("waterbot.discord.bot.scheduler.get_next_runs") as mock_get_next_runs:
+                mock_get_schedules.return_value = {"on": ["08:00"], "off": ["20:00"]}
+                mock_get_next_runs.return_value = mock_next_runs
+
+                response = self.bot._get_device_schedules_response("pump")
+
+                assert "Schedules for PUMP:" in response
+                assert "ON at 08:00 (next: 2024-01-01 08:00:00)" in response
+                assert "OFF at 20:00\n" in response
+                assert "07:00" not in response
+
     def test_get_schedules_response_empty(self):
         """Test get schedules response with no schedules."""
         with patch("waterbot.discord.bot.get_schedules") as mock_get_schedules:
@@ -417,6 +533,68 @@ class TestWaterBot:
 
             mock_cleanup.assert_called_once()
 
+    def test_stop_bot_closes_running_client(self):
+        """Test that stop_bot closes the client running on its own thread."""
+        loop = asyncio.new_event_loop()
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        self.bot.loop = loop
+        self.bot._bot_thread = thread
+
+        async def fake_close():
+            loop.call_soon(loop.stop)
+
+        try:
+            with patch.object(self.bot, "close", side_effect=fake_close) as mock_close:
+                with patch("waterbot.discord.bot.gpio_handler.cleanup") as mock_cleanup:
+                    self.bot.stop_bot()
+
+            mock_close.assert_called_once()
+            mock_cleanup.assert_called_once()
+            assert not thread.is_alive()
+        finally:
+            loop.close()
+
+    def test_get_ip_addresses_cached(self):
+        """Test that IP address discovery is cached between calls."""
+        with patch("waterbot.discord.bot.get_ip_addresses") as mock_discover:
+            mock_discover.return_value = {"eth0": "192.168.1.100"}
+
+            first = self.bot._get_ip_addresses()
+            second = self.bot._get_ip_addresses()
+
+            assert first == {"eth0": "192.168.1.100"}
+            assert second == first
+            mock_discover.assert_called_once()
+
+    def test_address_change_invalidates_ip_cache(self):
+        """Test that a netlink notification drops the cached IP addresses."""
+        monitor = Mock()
+        monitor.recv.side_effect = [b"event", BlockingIOError()]
+        self.bot._address_monitor = monitor
+        self.bot._ip_cache = (time.monotonic(), {"eth0": "192.168.1.100"})
+
+        self.bot._on_address_change()
+
+        assert self.bot._ip_cache is None
+        assert monitor.recv.call_count == 2
+
+    def test_parse_command_cached(self):
+        """Test that repeated commands are parsed once and params stay read-only."""
+        _parse_command_cached.cache_clear()
+        with patch("waterbot.discord.bot.parse_command") as mock_parse:
+            mock_parse.return_value = ("device_on", {"device": "pump", "timeout": 600})
+
+            first = _parse_command_cached("on pump")
+            second = _parse_command_cached("on pump")
+
+            mock_parse.assert_called_once_with("on pump")
+            assert first == second
+            assert dict(first[1]) == {"device": "pump", "timeout": 600}
+            with pytest.raises(TypeError):
+                first[1]["device"] = "light"  # type: ignore[index]
+        _parse_command_cached.cache_clear()
+
     def test_bot_instance_global(self):
         """Test global bot instance management."""
         test_bot = Mock()
@@ -444,6 +622,7 @@ class TestWaterBot:
                     mock_openai.return_value = "OpenAI response"
 
                     await self.bot.on_message(mock_message)
+                    await self._wait_for_message_tasks()
 
                     mock_openai.assert_called_once_with("What's the status?")
                     mock_message.channel.send.assert_called_once_with("OpenAI response")
@@ -453,3 +632,29 @@ class TestWaterBot:
         with patch("waterbot.discord.bot.DISCORD_BOT_TOKEN", None):
             with pytest.raises(ValueError, match="Discord bot token not configured"):
                 self.bot.start_bot()
+
+
+class TestSplitMessage:
+    """Test cases for splitting long Discord messages."""
+
+    def test_short_message_unchanged(self):
+        """Test that a message under the limit is sent as is."""
+        assert split_message("hello\nworld", limit=20) == ["hello\nworld"]
+
+    def test_split_at_line_boundaries(self):
+        """Test that long messages are split between lines."""
+        text = "aaaa\nbbbb\ncccc\n"
+
+        chunks = split_message(text, limit=10)
+
+        assert chunks == ["aaaa\nbbbb\n", "cccc\n"]
+        assert "".join(chunks) == text
+
+    def test_split_overlong_line(self):
+        """Test that a single line over the limit is split at the limit."""
+        text = "ab\n" + "x" * 12
+
+        chunks = split_message(text, limit=5)
+
+        assert all(len(chunk) <= 5 for chunk in chunks)
+        assert "".join(chunks) == text
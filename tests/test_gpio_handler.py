@@ -1,6 +1,8 @@
 """Tests for GPIO handler functionality."""
 
-from unittest.mock import Mock, patch
+from unittest.mock import MagicMock, Mock, patch
+
+import pytest
 
 from waterbot.gpio.handler import DeviceController
 from waterbot.gpio.interface import MockGPIO
@@ -78,6 +80,21 @@ class TestDeviceController:
         assert status["light"] is True
         assert status["fan"] is False
 
+    def test_get_status_snapshot_is_reused_until_change(self):
+        """Test that get_status returns a read-only snapshot rebuilt only on change."""
+        first = self.controller.get_status()
+
+        with pytest.raises(TypeError):
+            first["pump"] = True  # type: ignore[index]
+        assert self.controller.get_status() is first
+
+        self.controller.turn_on("pump")
+        second = self.controller.get_status()
+
+        assert first["pump"] is False
+        assert second["pump"] is True
+        assert second is not first
+
     def test_turn_all_on(self):
         """Test turning on all devices."""
         success = self.controller.turn_all_on()
@@ -98,31 +115,67 @@ class TestDeviceController:
         for device in self.device_config:
             assert self.controller.device_status[device] is False
 
+    def test_turn_all_on_takes_each_device_lock_once(self):
+        """Test that switching all devices takes every device lock exactly once."""
+        mock_locks = {device: MagicMock() for device in self.device_config}
+        for device, mock_lock in mock_locks.items():
+            self.controller.devices[device].lock = mock_lock
+
+        self.controller.turn_all_on()
+
+        for mock_lock in mock_locks.values():
+            mock_lock.__enter__.assert_called_once()
+        for pin in self.device_config.values():
+            assert (pin, True) in self.mock_gpio.output_calls
+
+    def test_device_locks_are_independent(self):
+        """Test that a held device lock does not block switching another device."""
+        with self.controller.devices["pump"].lock:
+            assert self.controller.turn_on("light") is True
+
+        assert self.controller.device_status["light"] is True
+
+    def test_turn_all_on_with_timeout(self):
+        """Test that a batch timeout schedules a revert for every device."""
+        with patch.object(self.controller.timers, "schedule", side_effect=[1, 2, 3]) as mock_schedule:
+            self.controller.turn_all_on(timeout=60)
+
+        assert mock_schedule.call_count == 3
+        assert self.controller.device_timers == {"pump": 1, "light": 2, "fan": 3}
+
     def test_turn_on_with_timeout(self):
         """Test turning on device with timeout."""
-        with patch("waterbot.gpio.handler.Timer") as mock_timer:
-            mock_timer_instance = Mock()
-            mock_timer.return_value = mock_timer_instance
-
+        with patch.object(self.controller.timers, "schedule", return_value=1) as mock_schedule:
             success = self.controller.turn_on("pump", timeout=5)
 
             assert success is True
             assert self.controller.device_status["pump"] is True
-            mock_timer.assert_called_once()
-            mock_timer_instance.start.assert_called_once()
+            mock_schedule.assert_called_once()
+            assert mock_schedule.call_args[0][0] == 5
+            assert self.controller.device_timers["pump"] == 1
+
+    def test_turn_on_cancels_previous_timer(self):
+        """Test that switching a device again cancels its pending timeout."""
+        with (
+            patch.object(self.controller.timers, "schedule", return_value=1),
+            patch.object(self.controller.timers, "cancel") as mock_cancel,
+        ):
+            self.controller.turn_on("pump", timeout=5)
+            self.controller.turn_off("pump")
+
+            mock_cancel.assert_called_once_with(1)
+            assert self.controller.device_timers["pump"] is None
 
     def test_cleanup(self):
         """Test cleanup functionality."""
         # Set up some active timers
-        with patch("waterbot.gpio.handler.Timer") as mock_timer:
-            mock_timer_instance = Mock()
-            mock_timer.return_value = mock_timer_instance
-
+        with patch.object(self.controller.timers, "cancel_all") as mock_cancel_all:
             self.controller.turn_on("pump", timeout=5)
             self.controller.cleanup()
 
-            # Check that timer was cancelled
-            mock_timer_instance.cancel.assert_called_once()
+            # Check that timers were cancelled
+            mock_cancel_all.assert_called_once()
+            assert self.controller.device_timers["pump"] is None
 
             # Check that GPIO cleanup was called
             assert self.mock_gpio.cleanup_called is True
@@ -137,6 +190,19 @@ class TestDeviceControllerModuleFunctions:
 
         handler._controller = None
 
+    @patch("waterbot.gpio.handler.DEVICE_TO_PIN", {"pump": 17})
+    @patch("waterbot.gpio.handler.IS_EMULATION", True)
+    def test_emulation_controller_does_not_import_rpi(self):
+        """Test that emulation mode never imports the RPi.GPIO extension."""
+        from waterbot.gpio.handler import _get_controller
+        from waterbot.gpio.interface import EmulationGPIO
+
+        # A None entry makes any import of the module raise ImportError
+        with patch.dict("sys.modules", {"RPi": None, "RPi.GPIO": None}):
+            controller = _get_controller()
+
+        assert isinstance(controller.gpio, EmulationGPIO)
+
     @patch("waterbot.gpio.handler.DEVICE_TO_PIN", {"pump": 17})
     @patch("waterbot.gpio.handler.IS_EMULATION", True)
     def test_module_turn_on(self):
@@ -169,3 +235,27 @@ class TestDeviceControllerModuleFunctions:
         status = get_status()
 
         assert status["pump"] is True
+
+    @patch("waterbot.gpio.handler.DEVICE_TO_PIN", {"pump": 17})
+    def test_controller_created_once_under_contention(self):
+        """Test that concurrent first calls share a single controller."""
+        import threading
+
+        import waterbot.gpio.handler as handler
+
+        barrier = threading.Barrier(4)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(handler._get_controller())
+
+        with patch("waterbot.gpio.handler.DeviceController", side_effect=lambda: Mock()) as mock_controller:
+            threads = [threading.Thread(target=worker) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        mock_controller.assert_called_once()
+        assert all(result is results[0] for result in results)
@@ -30,6 +30,17 @@ class TestEmulationGPIO:
         gpio.output(17, False)
         assert gpio.get_pin_state(17) is False
 
+    def test_output_many(self):
+        """Test that output_many falls back to one output per pin."""
+        gpio = EmulationGPIO()
+        gpio.setup(17, "OUT")
+        gpio.setup(18, "OUT")
+
+        gpio.output_many((17, 18), (True, False))
+
+        assert gpio.get_pin_state(17) is True
+        assert gpio.get_pin_state(18) is False
+
     def test_output_without_setup_raises_error(self):
         """Test that outputting without setup raises an error."""
         gpio = EmulationGPIO()
@@ -142,6 +153,35 @@ class TestHardwareGPIO:
             gpio.output(17, False)
             mock_gpio.output.assert_called_with(17, mock_gpio.LOW)
 
+    def test_output_sets_up_unconfigured_pin_once(self):
+        """Test that output configures an unknown pin once instead of relying on errors."""
+        mock_gpio = MagicMock()
+        mock_rpi = MagicMock()
+        mock_rpi.GPIO = mock_gpio
+
+        with patch.dict("sys.modules", {"RPi": mock_rpi, "RPi.GPIO": mock_gpio}):
+            gpio = HardwareGPIO()
+
+            gpio.output(17, True)
+            gpio.output(17, False)
+            mock_gpio.setup.assert_called_once_with(17, mock_gpio.OUT)
+
+            gpio.cleanup()
+            gpio.output(17, True)
+            assert mock_gpio.setup.call_count == 2
+
+    def test_output_many_uses_single_call(self):
+        """Test that several pins are written with one RPi.GPIO call."""
+        mock_gpio = MagicMock()
+        mock_rpi = MagicMock()
+        mock_rpi.GPIO = mock_gpio
+
+        with patch.dict("sys.modules", {"RPi": mock_rpi, "RPi.GPIO": mock_gpio}):
+            gpio = HardwareGPIO()
+
+            gpio.output_many((17, 18), (True, False))
+            mock_gpio.output.assert_called_once_with([17, 18], [mock_gpio.HIGH, mock_gpio.LOW])
+
     def test_cleanup(self):
         """Test hardware GPIO cleanup."""
         mock_gpio = MagicMock()
@@ -154,6 +194,23 @@ class TestHardwareGPIO:
 
             mock_gpio.cleanup.assert_called_once()
 
+    def test_output_restores_mode_only_after_cleanup(self):
+        """Test that the numbering mode is re-armed after cleanup, not checked per output."""
+        mock_gpio = MagicMock()
+        mock_rpi = MagicMock()
+        mock_rpi.GPIO = mock_gpio
+
+        with patch.dict("sys.modules", {"RPi": mock_rpi, "RPi.GPIO": mock_gpio}):
+            gpio = HardwareGPIO()
+            gpio.output(17, True)
+            mock_gpio.getmode.assert_not_called()
+            assert mock_gpio.setmode.call_count == 1
+
+            gpio.cleanup()
+            gpio.output(17, True)
+            gpio.output(17, False)
+            assert mock_gpio.setmode.call_count == 2
+
     def test_hardware_gpio_import_error(self):
         """Test hardware GPIO import error handling."""
         # Test case 1: ImportError when RPi module is not available
@@ -0,0 +1,71 @@
+"""Tests for the shared GPIO timer queue."""
+
+import threading
+
+from waterbot.gpio.timers import TimerQueue
+
+
+class TestTimerQueue:
+    """Test cases for TimerQueue."""
+
+    def test_callbacks_run_in_deadline_order(self):
+        """Test that callbacks run once their delay expires, earliest first."""
+        queue = TimerQueue()
+        calls = []
+        done = threading.Event()
+
+        queue.schedule(0.05, lambda: (calls.append("late"), done.set()))
+        queue.schedule(0.01, lambda: calls.append("early"))
+
+        assert done.wait(2)
+        assert calls == ["early", "late"]
+
+    def test_cancelled_callback_does_not_run(self):
+        """Test that a cancelled callback is skipped."""
+        queue = TimerQueue()
+        calls = []
+        done = threading.Event()
+
+        handle = queue.schedule(0.01, lambda: calls.append("cancelled"))
+        queue.cancel(handle)
+        queue.schedule(0.03, done.set)
+
+        assert done.wait(2)
+        assert calls == []
+
+    def test_cancel_all(self):
+        """Test that cancel_all drops every pending callback."""
+        queue = TimerQueue()
+        calls = []
+
+        queue.schedule(0.01, lambda: calls.append("first"))
+        queue.schedule(0.02, lambda: calls.append("second"))
+        queue.cancel_all()
+
+        done = threading.Event()
+        queue.schedule(0.03, done.set)
+        assert done.wait(2)
+        assert calls == []
+
+    def test_failing_callback_keeps_thread_running(self):
+        """Test that an exception in one callback does not stop later ones."""
+        queue = TimerQueue()
+        done = threading.Event()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        queue.schedule(0.01, fail)
+        queue.schedule(0.02, done.set)
+
+        assert done.wait(2)
+
+    def test_cancelled_entries_are_compacted(self):
+        """Test that cancelled entries do not pile up in the heap."""
+        queue = TimerQueue()
+
+        for _ in range(200):
+            queue.cancel(queue.schedule(3600, lambda: None))
+
+        assert len(queue._heap) <= 2 * len(queue._pending) + 32
+        queue.cancel_all()
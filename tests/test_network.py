@@ -0,0 +1,67 @@
+"""Tests for network interface utilities."""
+
+import socket
+from unittest.mock import patch
+
+from waterbot.utils.network import get_ip_addresses, open_address_monitor
+
+
+def _ifreq_with_address(ip: str) -> bytes:
+    """Build an ioctl result buffer carrying the given IPv4 address."""
+    return b"\x00" * 20 + socket.inet_aton(ip) + b"\x00" * 8
+
+
+class TestGetIPAddresses:
+    """Test cases for get_ip_addresses."""
+
+    @patch("waterbot.utils.network.fcntl.ioctl")
+    @patch("waterbot.utils.network.socket.if_nameindex")
+    def test_get_ip_addresses(self, mock_if_nameindex, mock_ioctl):
+        """Test that addresses are returned for every non-loopback interface."""
+        mock_if_nameindex.return_value = [(1, "lo"), (2, "eth0"), (3, "wlan0")]
+        mock_ioctl.side_effect = [
+            _ifreq_with_address("192.168.1.100"),
+            _ifreq_with_address("192.168.1.101"),
+        ]
+
+        result = get_ip_addresses()
+
+        assert result == {"eth0": "192.168.1.100", "wlan0": "192.168.1.101"}
+        assert mock_ioctl.call_count == 2
+
+    @patch("waterbot.utils.network.fcntl.ioctl")
+    @patch("waterbot.utils.network.socket.if_nameindex")
+    def test_get_ip_addresses_skips_interfaces_without_address(self, mock_if_nameindex, mock_ioctl):
+        """Test that interfaces without an IPv4 address are skipped."""
+        mock_if_nameindex.return_value = [(2, "eth0"), (3, "wlan0")]
+        mock_ioctl.side_effect = [OSError(99, "Cannot assign requested address"), _ifreq_with_address("10.0.0.5")]
+
+        result = get_ip_addresses()
+
+        assert result == {"wlan0": "10.0.0.5"}
+
+    @patch("waterbot.utils.network.socket.if_nameindex", side_effect=OSError("not supported"))
+    def test_get_ip_addresses_no_interfaces(self, mock_if_nameindex):
+        """Test that an empty mapping is returned when interfaces cannot be listed."""
+        assert get_ip_addresses() == {}
+
+
+class TestOpenAddressMonitor:
+    """Test cases for open_address_monitor."""
+
+    def test_open_address_monitor_unavailable(self):
+        """Test that None is returned when netlink cannot be opened."""
+        with patch("waterbot.utils.network.socket.socket", side_effect=OSError("not permitted")):
+            assert open_address_monitor() is None
+
+    def test_open_address_monitor_subscribes_to_changes(self):
+        """Test that the socket joins the link and IPv4 address groups."""
+        with patch("waterbot.utils.network.socket.socket") as mock_socket:
+            monitor = open_address_monitor()
+
+        if not hasattr(socket, "AF_NETLINK"):
+            assert monitor is None
+            return
+        monitor.bind.assert_called_once_with((0, 0x1 | 0x10))
+        monitor.setblocking.assert_called_once_with(False)
+        assert monitor is mock_socket.return_value
@@ -1,11 +1,16 @@
 """Tests for waterbot/openai_integration.py."""
 
-import subprocess
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import MagicMock, patch
 
 import pytest
 
 from waterbot.openai_integration import (
+    _TOOL_HANDLERS,
+    _execute_tool_calls,
     execute_tool_call,
     get_available_tools,
     process_with_openai,
@@ -31,6 +36,15 @@ class TestOpenAIIntegration:
             assert "description" in tool["function"]
             assert "parameters" in tool["function"]
 
+    def test_get_available_tools_is_built_once(self):
+        """Test that the tool schemas are reused between calls."""
+        assert get_available_tools() is get_available_tools()
+
+    def test_every_tool_has_a_handler(self):
+        """Test that each advertised tool is dispatched to a handler."""
+        for tool in get_available_tools():
+            assert tool["function"]["name"] in _TOOL_HANDLERS
+
     def test_get_available_tools_function_names(self):
         """Test that expected functions are available."""
         tools = get_available_tools()
@@ -146,6 +160,19 @@ class TestOpenAIIntegration:
         assert "All devices turned OFF" in result
         mock_gpio_handler.turn_all_off.assert_called_once()
 
+    @patch("waterbot.openai_integration.scheduler")
+    def test_execute_tool_replace_device_schedule_partial_failure(self, mock_scheduler):
+        """Test that replace_device_schedule reports entries the scheduler rejected."""
+        mock_scheduler.replace_schedules.return_value = (2, [("on", "06:01")])
+        periods = [{"start_time": "06:01", "end_time": "6:06"}]
+
+        result = execute_tool_call("replace_device_schedule", {"device": "pump", "schedule_periods": periods})
+
+        mock_scheduler.replace_schedules.assert_called_once_with("pump", [("on", "06:01"), ("off", "6:06")])
+        assert "Removed 2 existing schedules" in result
+        assert "Added 1 new schedules" in result
+        assert "Failed to add: off at 6:06" in result
+
     @patch("waterbot.openai_integration.scheduler")
     def test_execute_tool_add_schedule(self, mock_scheduler):
         """Test execute_tool_call for add_schedule."""
@@ -200,7 +227,7 @@ class TestOpenAIIntegration:
             }
         ]
 
-        with patch("waterbot.config.get_schedules", return_value=mock_schedules):
+        with patch("waterbot.openai_integration.get_schedules", return_value=mock_schedules):
             result = execute_tool_call("get_schedules", {})
 
         assert "Device Schedules:" in result
@@ -215,7 +242,7 @@ class TestOpenAIIntegration:
         mock_schedules = {"on": ["09:00"], "off": ["18:00"]}
         mock_scheduler.get_next_runs.return_value = []
 
-        with patch("waterbot.config.get_schedules", return_value=mock_schedules):
+        with patch("waterbot.openai_integration.get_schedules", return_value=mock_schedules):
             result = execute_tool_call("get_schedules", {"device": "pump"})
 
         assert "Device Schedules:" in result
@@ -226,96 +253,72 @@ class TestOpenAIIntegration:
     @patch("waterbot.openai_integration.scheduler")
     def test_execute_tool_get_schedules_no_schedules(self, mock_scheduler):
         """Test execute_tool_call for get_schedules (no schedules)."""
-        with patch("waterbot.config.get_schedules", return_value={}):
+        with patch("waterbot.openai_integration.get_schedules", return_value={}):
             result = execute_tool_call("get_schedules", {})
 
         assert "No schedules configured" in result
 
-    def test_execute_tool_get_current_time(self):
+    @patch("waterbot.openai_integration.get_timezone_name", return_value="America/New_York")
+    def test_execute_tool_get_current_time(self, mock_get_timezone_name):
         """Test execute_tool_call for get_current_time."""
-        with patch("subprocess.run") as mock_run:
-            mock_run.return_value.returncode = 0
-            mock_run.return_value.stdout = "America/New_York"
-
-            result = execute_tool_call("get_current_time", {})
+        result = execute_tool_call("get_current_time", {})
 
-            assert "Current Time:" in result
+        assert "Current Time:" in result
+        assert "Timezone: America/New_York" in result
 
-    def test_execute_tool_get_current_time_subprocess_error(self):
-        """Test execute_tool_call for get_current_time with subprocess error."""
-        with patch("subprocess.run", side_effect=FileNotFoundError()):
-            result = execute_tool_call("get_current_time", {})
+    @patch("waterbot.openai_integration.get_timezone_name", return_value=None)
+    def test_execute_tool_get_current_time_unknown_timezone(self, mock_get_timezone_name):
+        """Test execute_tool_call for get_current_time without a known timezone."""
+        result = execute_tool_call("get_current_time", {})
 
-            assert "Current Time:" in result
+        assert "Current Time:" in result
+        assert "Timezone:" not in result
 
-    def test_execute_tool_get_ip_addresses(self):
+    @patch("waterbot.openai_integration.get_ip_addresses")
+    def test_execute_tool_get_ip_addresses(self, mock_get_ip_addresses):
         """Test execute_tool_call for get_ip_addresses."""
-        with patch("subprocess.run") as mock_run:
-            # Mock successful interface listing
-            mock_run.side_effect = [
-                MagicMock(stdout="eth0\nwlan0\n", returncode=0),
-                MagicMock(
-                    stdout=(
-                        "2: eth0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq "
-                        "state UP qlen 1000\n    inet 192.168.1.100/24 brd "
-                        "192.168.1.255 "
-                        "scope global dynamic"
-                    ),
-                    returncode=0,
-                ),
-                MagicMock(
-                    stdout=(
-                        "3: wlan0: <BROADCAST,MULTICAST,UP,LOWER_UP> mtu 1500 qdisc mq "
-                        "state UP qlen 1000\n    inet 192.168.1.101/24 brd "
-                        "192.168.1.255 "
-                        "scope global dynamic"
-                    ),
-                    returncode=0,
-                ),
-            ]
-
-            result = execute_tool_call("get_ip_addresses", {})
-
-            assert "SSH Access Information:" in result
-            assert "ssh pi@192.168.1.100" in result
-            assert "ssh pi@192.168.1.101" in result
-
-    def test_execute_tool_get_ip_addresses_no_interfaces(self):
+        mock_get_ip_addresses.return_value = {"eth0": "192.168.1.100", "wlan0": "192.168.1.101"}
+
+        result = execute_tool_call("get_ip_addresses", {})
+
+        assert "SSH Access Information:" in result
+        assert "ssh pi@192.168.1.100" in result
+        assert "ssh pi@192.168.1.101" in result
+
+    @patch("waterbot.openai_integration.get_ip_addresses", return_value={})
+    def test_execute_tool_get_ip_addresses_no_interfaces(self, mock_get_ip_addresses):
         """Test execute_tool_call for get_ip_addresses with no interfaces."""
-        with patch("subprocess.run", side_effect=subprocess.CalledProcessError(1, "ls")):
-            result = execute_tool_call("get_ip_addresses", {})
+        result = execute_tool_call("get_ip_addresses", {})
 
-            assert "No network interfaces found" in result
+        assert "No network interfaces found" in result
 
     @patch("waterbot.openai_integration.scheduler")
     def test_execute_tool_clear_device_schedule(self, mock_scheduler):
         """Test execute_tool_call for clear_device_schedule."""
-        mock_schedules = {"on": ["09:00"], "off": ["18:00"]}
-        mock_scheduler.remove_schedule.return_value = True
+        mock_scheduler.replace_schedules.return_value = (2, [])
 
-        with patch("waterbot.config.get_schedules", return_value=mock_schedules):
-            result = execute_tool_call("clear_device_schedule", {"device": "pump"})
+        result = execute_tool_call("clear_device_schedule", {"device": "pump"})
 
         assert "Cleared all schedules for 'pump' - removed 2 schedule entries" in result
-        assert mock_scheduler.remove_schedule.call_count == 2
+        mock_scheduler.replace_schedules.assert_called_once_with("pump", [])
 
     @patch("waterbot.openai_integration.scheduler")
     def test_execute_tool_replace_device_schedule(self, mock_scheduler):
         """Test execute_tool_call for replace_device_schedule."""
-        mock_schedules = {"on": ["09:00"], "off": ["18:00"]}
-        mock_scheduler.remove_schedule.return_value = True
-        mock_scheduler.add_schedule.return_value = True
+        entries = [("on", "08:00"), ("off", "12:00"), ("on", "14:00"), ("off", "18:00")]
+        mock_scheduler.replace_schedules.return_value = (2, entries)
 
         schedule_periods = [
             {"start_time": "08:00", "end_time": "12:00"},
             {"start_time": "14:00", "end_time": "18:00"},
         ]
 
-        with patch("waterbot.config.get_schedules", return_value=mock_schedules):
-            result = execute_tool_call(
-                "replace_device_schedule",
-                {"device": "pump", "schedule_periods": schedule_periods},
-            )
+        result = execute_tool_call(
+            "replace_device_schedule",
+            {"device": "pump", "schedule_periods": schedule_periods},
+        )
+
+        mock_scheduler.replace_schedules.assert_called_once_with("pump", entries)
 
         assert "Schedule replacement for 'pump' completed" in result
         assert "Removed 2 existing schedules" in result
@@ -407,6 +410,144 @@ class TestOpenAIIntegration:
             assert result == "Final response"
             assert mock_client.chat.completions.create.call_count == 2
 
+    @pytest.mark.asyncio
+    async def test_process_with_openai_action_only_round_skips_follow_up(self):
+        """Test that successful action tools are reported without a second completion."""
+        mock_client = MagicMock()
+
+        mock_tool_call = MagicMock()
+        mock_tool_call.id = "call_123"
+        mock_tool_call.function.name = "turn_device_on"
+        mock_tool_call.function.arguments = '{"device": "pump"}'
+
+        mock_response = MagicMock()
+        mock_response.choices[0].message.content = None
+        mock_response.choices[0].message.tool_calls = [mock_tool_call]
+
+        mock_client.chat.completions.create = MagicMock(return_value=mock_response)
+
+        with (
+            patch("waterbot.openai_integration.client", mock_client),
+            patch("waterbot.openai_integration.execute_tool_call", return_value="Device 'pump' turned ON"),
+        ):
+            result = await process_with_openai("turn on pump")
+
+        assert result == "Device 'pump' turned ON"
+        mock_client.chat.completions.create.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_process_with_openai_failed_action_asks_model(self):
+        """Test that a failed action is still passed back to the model."""
+        mock_client = MagicMock()
+
+        mock_tool_call = MagicMock()
+        mock_tool_call.id = "call_123"
+        mock_tool_call.function.name = "turn_device_on"
+        mock_tool_call.function.arguments = '{"device": "pmup"}'
+
+        mock_first_response = MagicMock()
+        mock_first_response.choices[0].message.content = None
+        mock_first_response.choices[0].message.tool_calls = [mock_tool_call]
+
+        mock_second_response = MagicMock()
+        mock_second_response.choices[0].message.content = "There is no device called pmup."
+        mock_second_response.choices[0].message.tool_calls = None
+
+        mock_client.chat.completions.create = MagicMock(side_effect=[mock_first_response, mock_second_response])
+
+        with (
+            patch("waterbot.openai_integration.client", mock_client),
+            patch("waterbot.openai_integration.execute_tool_call", return_value="Error: Unknown device 'pmup'"),
+        ):
+            result = await process_with_openai("turn on pmup")
+
+        assert result == "There is no device called pmup."
+        assert mock_client.chat.completions.create.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_process_with_openai_last_round_omits_tools(self):
+        """Test that the completion after the last tool round is sent without tools."""
+        mock_client = MagicMock()
+
+        mock_tool_call = MagicMock()
+        mock_tool_call.id = "call_123"
+        mock_tool_call.function.name = "get_schedules"
+        mock_tool_call.function.arguments = "{}"
+
+        mock_tool_response = MagicMock()
+        mock_tool_response.choices[0].message.content = None
+        mock_tool_response.choices[0].message.tool_calls = [mock_tool_call]
+
+        mock_client.chat.completions.create = MagicMock(return_value=mock_tool_response)
+
+        with (
+            patch("waterbot.openai_integration.client", mock_client),
+            patch("waterbot.openai_integration.execute_tool_call", return_value="Tool result"),
+        ):
+            await process_with_openai("test message")
+
+        calls = mock_client.chat.completions.create.call_args_list
+        assert len(calls) == 6
+        assert all("tools" in call.kwargs for call in calls[:-1])
+        assert "tools" not in calls[-1].kwargs
+
+    def test_execute_tool_calls_runs_in_order(self):
+        """Test that one round of tool calls is executed in call order."""
+        calls = []
+        for name in ("get_schedules", "replace_device_schedule"):
+            tool_call = MagicMock()
+            tool_call.function.name = name
+            tool_call.function.arguments = "{}"
+            calls.append(tool_call)
+
+        with patch("waterbot.openai_integration.execute_tool_call", side_effect=lambda name, args: name):
+            results = _execute_tool_calls(calls)
+
+        assert results == ["get_schedules", "replace_device_schedule"]
+
+    def test_process_with_openai_survives_new_event_loop(self):
+        """Test that the client keeps working when the bot restarts on a new event loop."""
+        import openai
+
+        completion = json.dumps(
+            {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-4o-mini",
+                "choices": [
+                    {"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "Hello"}}
+                ],
+            }
+        ).encode()
+
+        class CompletionStub(BaseHTTPRequestHandler):
+            # Keep-alive, so the client reuses pooled connections between calls
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):  # noqa: N802
+                self.rfile.read(int(self.headers["Content-Length"]))
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(completion)))
+                self.end_headers()
+                self.wfile.write(completion)
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), CompletionStub)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            client = openai.OpenAI(api_key="test", base_url=f"http://127.0.0.1:{server.server_port}/v1")
+            with client, patch("waterbot.openai_integration.client", client):
+                # Each bot restart runs on a fresh event loop
+                assert asyncio.run(process_with_openai("hi")) == "Hello"
+                assert asyncio.run(process_with_openai("hi")) == "Hello"
+        finally:
+            server.shutdown()
+            server.server_close()
+
     @pytest.mark.asyncio
     async def test_process_with_openai_exception(self):
         """Test process_with_openai exception handling."""
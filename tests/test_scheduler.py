@@ -1,8 +1,9 @@
 """Tests for scheduler functionality."""
 
+import concurrent.futures
 from unittest.mock import Mock, patch
 
-from waterbot.scheduler import DeviceScheduler
+from waterbot.scheduler import _MAX_IDLE_SECONDS, DeviceScheduler, _JobEntry, _log_notification_result
 
 
 class TestDeviceScheduler:
@@ -61,10 +62,10 @@ class TestDeviceScheduler:
 
             # Verify job was created
             assert len(self.scheduler.scheduled_jobs) == 1
-            job_info = self.scheduler.scheduled_jobs[0]
-            assert job_info["device"] == "pump"
-            assert job_info["action"] == "on"
-            assert job_info["time"] == "08:00"
+            job_info = self.scheduler.scheduled_jobs[("pump", "on", "08:00")]
+            assert job_info.device == "pump"
+            assert job_info.action == "on"
+            assert job_info.time == "08:00"
 
             # Simulate job execution
             scheduled_function = mock_schedule.every.return_value.day.at.return_value.do.call_args[0][0]
@@ -119,7 +120,7 @@ class TestDeviceScheduler:
 
         # Set up a scheduled job
         mock_job = Mock()
-        self.scheduler.scheduled_jobs.append({"device": "pump", "action": "on", "time": "08:00", "job": mock_job})
+        self.scheduler.scheduled_jobs[("pump", "on", "08:00")] = _JobEntry("pump", "on", "08:00", mock_job)
 
         success = self.scheduler.remove_schedule("pump", "on", "08:00")
 
@@ -128,6 +129,28 @@ class TestDeviceScheduler:
         mock_schedule.cancel_job.assert_called_once_with(mock_job)
         mock_config_remove.assert_called_once_with("pump", "on", "08:00")
 
+    @patch("waterbot.config.replace_schedules")
+    @patch("waterbot.scheduler.schedule")
+    def test_replace_schedules(self, mock_schedule, mock_config_replace):
+        """Test replacing a device's schedules cancels its jobs and schedules the new ones."""
+        mock_config_replace.return_value = (1, [("on", "21:00"), ("off", "21:05")])
+        pump_job = Mock()
+        light_job = Mock()
+        self.scheduler.scheduled_jobs[("pump", "on", "08:00")] = _JobEntry("pump", "on", "08:00", pump_job)
+        self.scheduler.scheduled_jobs[("light", "on", "06:30")] = _JobEntry("light", "on", "06:30", light_job)
+
+        removed, added = self.scheduler.replace_schedules("pump", [("on", "21:00"), ("off", "21:05")])
+
+        assert removed == 1
+        assert added == [("on", "21:00"), ("off", "21:05")]
+        mock_schedule.cancel_job.assert_called_once_with(pump_job)
+        mock_config_replace.assert_called_once_with("pump", [("on", "21:00"), ("off", "21:05")])
+        assert sorted(self.scheduler.scheduled_jobs) == [
+            ("light", "on", "06:30"),
+            ("pump", "off", "21:05"),
+            ("pump", "on", "21:00"),
+        ]
+
     @patch("waterbot.config.remove_schedule")
     def test_remove_schedule_not_found(self, mock_config_remove):
         """Test removing a schedule that doesn't exist."""
@@ -149,10 +172,10 @@ class TestDeviceScheduler:
         mock_job2 = Mock()
         mock_job2.next_run = future_time + timedelta(hours=2)
 
-        self.scheduler.scheduled_jobs = [
-            {"device": "pump", "action": "on", "time": "08:00", "job": mock_job1},
-            {"device": "light", "action": "off", "time": "22:00", "job": mock_job2},
-        ]
+        self.scheduler.scheduled_jobs = {
+            ("light", "off", "22:00"): _JobEntry("light", "off", "22:00", mock_job2),
+            ("pump", "on", "08:00"): _JobEntry("pump", "on", "08:00", mock_job1),
+        }
 
         next_runs = self.scheduler.get_next_runs()
 
@@ -216,21 +239,94 @@ class TestDeviceScheduler:
             mock_schedule.clear.assert_not_called()
 
     @patch("waterbot.scheduler.schedule")
-    @patch("waterbot.scheduler.time.sleep")
-    def test_run_scheduler_loop(self, mock_sleep, mock_schedule):
-        """Test the scheduler loop execution."""
+    def test_run_scheduler_loop(self, mock_schedule):
+        """Test the scheduler loop sleeps until the next job is due."""
         self.scheduler.running = True
+        mock_schedule.idle_seconds.return_value = 12.5
 
-        # Mock sleep to only run once
+        # Stop after the first wait
         def stop_after_first_iteration(*args):
             self.scheduler.running = False
 
-        mock_sleep.side_effect = stop_after_first_iteration
-
-        self.scheduler._run_scheduler()
+        with patch.object(self.scheduler._wake, "wait", side_effect=stop_after_first_iteration) as mock_wait:
+            self.scheduler._run_scheduler()
 
         mock_schedule.run_pending.assert_called_once()
-        mock_sleep.assert_called_once_with(1)
+        mock_wait.assert_called_once_with(12.5)
+
+    @patch("waterbot.scheduler.schedule")
+    def test_run_scheduler_loop_caps_wait(self, mock_schedule):
+        """Test the wait is capped when no job is due soon."""
+        self.scheduler.running = True
+        mock_schedule.idle_seconds.return_value = None
+
+        def stop_after_first_iteration(*args):
+            self.scheduler.running = False
+
+        with patch.object(self.scheduler._wake, "wait", side_effect=stop_after_first_iteration) as mock_wait:
+            self.scheduler._run_scheduler()
+
+        mock_wait.assert_called_once_with(_MAX_IDLE_SECONDS)
+
+    @patch("waterbot.scheduler.schedule")
+    def test_schedule_same_action_twice_replaces_job(self, mock_schedule):
+        """Test that re-adding a schedule cancels the earlier job instead of duplicating it."""
+        first_job, second_job = Mock(), Mock()
+        mock_schedule.every.return_value.day.at.return_value.do.side_effect = [first_job, second_job]
+
+        with patch("waterbot.scheduler.gpio_handler"):
+            self.scheduler._schedule_device_action("pump", "on", "08:00")
+            self.scheduler._schedule_device_action("pump", "on", "08:00")
+
+        mock_schedule.cancel_job.assert_called_once_with(first_job)
+        assert len(self.scheduler.scheduled_jobs) == 1
+        assert self.scheduler.scheduled_jobs[("pump", "on", "08:00")].job is second_job
+
+    @patch("waterbot.scheduler.schedule")
+    def test_new_job_wakes_scheduler_thread(self, mock_schedule):
+        """Test that scheduling a job wakes the waiting scheduler thread."""
+        with patch("waterbot.scheduler.gpio_handler"):
+            self.scheduler._schedule_device_action("pump", "on", "08:00")
+
+        assert self.scheduler._wake.is_set()
+
+    def test_send_discord_notification_does_not_block(self):
+        """Test that notifications are handed to the bot loop without waiting."""
+        bot = Mock()
+        bot.loop.is_closed.return_value = False
+        future = Mock()
+
+        with (
+            patch("waterbot.discord.bot.WaterBot.instance", return_value=bot),
+            patch("waterbot.scheduler.asyncio.run_coroutine_threadsafe", return_value=future) as mock_submit,
+        ):
+            self.scheduler._send_discord_notification("pump", "on", True)
+
+        mock_submit.assert_called_once_with(bot.target_channel.send.return_value, bot.loop)
+        assert "Scheduled ON" in bot.target_channel.send.call_args[0][0]
+        future.add_done_callback.assert_called_once_with(_log_notification_result)
+        future.result.assert_not_called()
+
+    def test_send_discord_notification_without_bot(self):
+        """Test that a missing bot skips the notification."""
+        with (
+            patch("waterbot.discord.bot.WaterBot.instance", return_value=None),
+            patch("waterbot.scheduler.asyncio.run_coroutine_threadsafe") as mock_submit,
+        ):
+            self.scheduler._send_discord_notification("pump", "on", True)
+
+        mock_submit.assert_not_called()
+
+    def test_log_notification_result_failure(self):
+        """Test that a failed send is logged from the done callback."""
+        future = concurrent.futures.Future()
+        future.set_exception(RuntimeError("boom"))
+
+        with patch("waterbot.scheduler.logger") as mock_logger:
+            _log_notification_result(future)
+
+        args = mock_logger.error.call_args[0]
+        assert "boom" in args[0] % args[1:]
 
 
 class TestSchedulerModuleFunctions:
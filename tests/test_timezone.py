@@ -0,0 +1,42 @@
+"""Tests for system timezone lookup."""
+
+from unittest.mock import mock_open, patch
+
+import pytest
+
+from waterbot.utils.timezone import get_timezone_name
+
+
+@pytest.fixture(autouse=True)
+def clear_timezone_cache():
+    """Reset the cached timezone around each test."""
+    get_timezone_name.cache_clear()
+    yield
+    get_timezone_name.cache_clear()
+
+
+class TestGetTimezoneName:
+    """Test cases for get_timezone_name."""
+
+    def test_reads_timezone_file(self):
+        """Test that /etc/timezone is used when present."""
+        with patch("builtins.open", mock_open(read_data="Europe/Berlin\n")) as mocked:
+            assert get_timezone_name() == "Europe/Berlin"
+            assert get_timezone_name() == "Europe/Berlin"
+
+        mocked.assert_called_once_with("/etc/timezone")
+
+    @patch("waterbot.utils.timezone.os.path.realpath", return_value="/usr/share/zoneinfo/America/New_York")
+    def test_falls_back_to_localtime_link(self, mock_realpath):
+        """Test that the /etc/localtime symlink target is used without /etc/timezone."""
+        with patch("builtins.open", side_effect=FileNotFoundError()):
+            assert get_timezone_name() == "America/New_York"
+
+    @patch("waterbot.utils.timezone.os.path.realpath", return_value="/etc/localtime")
+    def test_falls_back_to_tzname(self, mock_realpath):
+        """Test that the C library timezone name is used as a last resort."""
+        with (
+            patch("builtins.open", side_effect=FileNotFoundError()),
+            patch("waterbot.utils.timezone.time.tzname", ("UTC", "UTC")),
+        ):
+            assert get_timezone_name() == "UTC"
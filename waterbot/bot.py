@@ -10,26 +10,38 @@ from .config import DEBUG_MODE, ENABLE_SCHEDULING, LOG_LEVEL, validate_config
 from .discord.bot import WaterBot
 from .gpio import handler as gpio_handler
 
-# Configure logging
-log_level = getattr(logging, LOG_LEVEL)
-logging.basicConfig(
-    level=log_level,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[logging.StreamHandler(), logging.FileHandler("waterbot.log")],
-)
-
-# Configure root logger
 logger = logging.getLogger("waterbot")
-if DEBUG_MODE:
-    logger.setLevel(logging.DEBUG)
-    # Also set DEBUG level for all discord bot loggers
-    logging.getLogger("discord_bot").setLevel(logging.DEBUG)
 
-logger.debug(
-    "Logging initialized with level=%s, debug_mode=%s",
-    LOG_LEVEL,
-    DEBUG_MODE,
-)
+_logging_configured = False
+
+
+def _configure_logging() -> None:
+    """Configure application logging once per process."""
+    global _logging_configured
+    if _logging_configured:
+        return
+
+    logging.basicConfig(
+        level=getattr(logging, LOG_LEVEL),
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(), logging.FileHandler("waterbot.log")],
+    )
+
+    # Configure root logger
+    if DEBUG_MODE:
+        logger.setLevel(logging.DEBUG)
+        # Also set DEBUG level for all discord bot loggers
+        logging.getLogger("discord_bot").setLevel(logging.DEBUG)
+
+    _logging_configured = True
+    logger.debug(
+        "Logging initialized with level=%s, debug_mode=%s",
+        LOG_LEVEL,
+        DEBUG_MODE,
+    )
+
+
+_configure_logging()
 
 
 def handle_shutdown(signum: int, frame: Any) -> None:
@@ -78,7 +90,7 @@ def main() -> None:
             logger.info("Keyboard interrupt received")
             break
         except Exception as e:
-            logger.error(f"Discord bot crashed: {e}", exc_info=True)
+            logger.error("Discord bot crashed: %s", e, exc_info=True)
             logger.info("Attempting to restart Discord bot in 30 seconds...")
 
             # Clean up current bot instance
@@ -86,7 +98,7 @@ def main() -> None:
                 try:
                     bot.stop_bot()
                 except Exception as cleanup_error:
-                    logger.error(f"Error during bot cleanup: {cleanup_error}")
+                    logger.error("Error during bot cleanup: %s", cleanup_error)
 
             # Wait before restarting
             import time
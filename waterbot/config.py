@@ -3,7 +3,7 @@
 import json
 import os
 import re
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 from dotenv import load_dotenv
 
@@ -53,17 +53,16 @@ def load_schedules() -> None:
     """Load device schedules from JSON configuration file."""
     global DEVICE_SCHEDULES
 
-    # Load from JSON file only
-    if os.path.exists(SCHEDULE_CONFIG_FILE):
-        try:
-            with open(SCHEDULE_CONFIG_FILE, "r") as f:
-                DEVICE_SCHEDULES = json.load(f)
-        except (json.JSONDecodeError, IOError) as e:
-            print(f"Warning: Could not load schedule config file " f"{SCHEDULE_CONFIG_FILE}: {e}")
-            DEVICE_SCHEDULES = {}
-    else:
+    # Load from JSON file only; open directly instead of checking existence first
+    try:
+        with open(SCHEDULE_CONFIG_FILE, "r") as f:
+            DEVICE_SCHEDULES = json.load(f)
+    except FileNotFoundError:
         # No config file exists, start with empty schedules
         DEVICE_SCHEDULES = {}
+    except (json.JSONDecodeError, IOError) as e:
+        print(f"Warning: Could not load schedule config file " f"{SCHEDULE_CONFIG_FILE}: {e}")
+        DEVICE_SCHEDULES = {}
 
 
 def save_schedules() -> bool:
@@ -137,6 +136,39 @@ def remove_schedule(device: str, action: str, time: str) -> bool:
     return False
 
 
+def replace_schedules(device: str, entries: Iterable[Tuple[str, str]]) -> Tuple[int, List[Tuple[str, str]]]:
+    """Replace all schedules for a device, saving the file once.
+
+    Args:
+        device (str): Device name
+        entries: (action, time) pairs to schedule; invalid pairs are skipped
+
+    Returns:
+        tuple: Number of removed schedule entries and the (action, time) pairs
+            that were added. No pairs are reported as added if saving fails.
+    """
+    removed = DEVICE_SCHEDULES.pop(device, {})
+    removed_count = sum(len(times) for times in removed.values())
+
+    added: List[Tuple[str, str]] = []
+    new_schedules: Dict[str, List[str]] = {}
+    if device in DEVICE_TO_PIN:
+        for action, time in entries:
+            if action not in ["on", "off"] or not re.match(r"^\d{2}:\d{2}$", time):
+                continue
+            times = new_schedules.setdefault(action, [])
+            if time not in times:
+                times.append(time)
+                added.append((action, time))
+
+    if new_schedules:
+        DEVICE_SCHEDULES[device] = {action: sorted(times) for action, times in new_schedules.items()}
+
+    if not save_schedules():
+        return removed_count, []
+    return removed_count, added
+
+
 def get_schedules(device: Optional[str] = None) -> Dict[str, Any]:
     """Get schedules for a device or all devices.
 
@@ -148,7 +180,7 @@ def get_schedules(device: Optional[str] = None) -> Dict[str, Any]:
     """
     if device:
         return dict(DEVICE_SCHEDULES.get(device, {}))
-    return dict(DEVICE_SCHEDULES.copy())
+    return dict(DEVICE_SCHEDULES)
 
 
 # Load schedules on import
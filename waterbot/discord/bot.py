@@ -1,8 +1,13 @@
 """Discord bot implementation for WaterBot."""
 
+import asyncio
+import functools
 import logging
-import subprocess  # nosec B404
-from typing import Any, Callable, Dict, Optional
+import socket
+import threading
+import time
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, ClassVar, Dict, List, Mapping, Optional, Set, Tuple
 
 import discord
 from discord.ext import commands
@@ -12,21 +17,110 @@ from ..config import (
     DEBUG_MODE,
     DISCORD_BOT_TOKEN,
     DISCORD_CHANNEL_ID,
-    LOG_LEVEL,
     OPENAI_API_KEY,
     get_schedules,
 )
 from ..gpio import handler as gpio_handler
 from ..openai_integration import process_with_openai
 from ..utils.command_parser import parse_command
+from ..utils.network import get_ip_addresses, open_address_monitor
+from ..utils.timezone import get_timezone_name
 
-# Configure logging
-log_level = getattr(logging, LOG_LEVEL)
-logging.basicConfig(level=log_level, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+# Logging handlers are configured once by the application entry point (waterbot.bot)
 logger = logging.getLogger("discord_bot")
 if DEBUG_MODE:
     logger.setLevel(logging.DEBUG)
 
+# Maximum length of a single Discord message
+DISCORD_MESSAGE_LIMIT = 2000
+
+# How long discovered IP addresses are reused before querying interfaces again (seconds)
+IP_CACHE_TTL = 300
+
+# Static help text, built once at import instead of on every help request
+_HELP_COMMANDS = (
+    "**Available commands:**\n"
+    "```\n"
+    "status - Show status of all devices\n"
+    "on <device> [minutes] - Turn on a device\n"
+    "off <device> [minutes] - Turn off a device\n"
+    "on all - Turn on all devices\n"
+    "off all - Turn off all devices\n"
+    "schedules - Show all schedules\n"
+    "schedule for <device> - Show schedules for specific device\n"
+    "schedule <device> <on|off> <HH:MM> - Add schedule\n"
+    "unschedule <device> <on|off> <HH:MM> - Remove schedule\n"
+    "time - Show current time on bot node\n"
+    "ip - Show SSH access information\n"
+    "test - Test notification system\n"
+    "```\n"
+)
+_HELP_AI = _HELP_COMMANDS + "🤖 AI-powered conversational interface enabled!"
+_HELP_PLAIN = _HELP_COMMANDS + "💡 Tip: Set OPENAI_API_KEY for conversational AI interface."
+
+# Startup announcement headers; only the SSH access lines vary at runtime
+_STARTUP_HEADER_AI = (
+    "WaterBot is now online! 💧\n"
+    "🤖 AI-powered conversational interface enabled!\n"
+    "Just chat with me naturally to control devices.\n\n"
+)
+_STARTUP_HEADER_PLAIN = (
+    "WaterBot is now online! 💧\n"
+    "Send `status` to check device status.\n"
+    "💡 Tip: Set OPENAI_API_KEY for conversational AI interface.\n\n"
+)
+
+
+def split_message(text: str, limit: int = DISCORD_MESSAGE_LIMIT) -> List[str]:
+    """Split text into chunks that each fit in one Discord message.
+
+    Chunks break at line boundaries; a single line longer than the limit is split
+    at the limit.
+    """
+    if len(text) <= limit:
+        return [text]
+
+    chunks: List[str] = []
+    buf: List[str] = []
+    size = 0
+    for line in text.splitlines(keepends=True):
+        while len(line) > limit:
+            head, line = line[:limit], line[limit:]
+            if buf:
+                chunks.append("".join(buf))
+                buf, size = [], 0
+            chunks.append(head)
+        if size + len(line) > limit:
+            chunks.append("".join(buf))
+            buf, size = [], 0
+        buf.append(line)
+        size += len(line)
+
+    if buf:
+        chunks.append("".join(buf))
+    return chunks
+
+
+def _format_ssh_lines(ip_info: Mapping[str, str]) -> str:
+    """Format one SSH command line per network interface."""
+    return "".join(f"• `ssh pi@{ip}` (via {interface})\n" for interface, ip in ip_info.items())
+
+
+def _index_next_runs(next_runs: List[Dict[str, Any]]) -> Dict[Tuple[str, str, str], str]:
+    """Map each (device, action, time) schedule entry to its next run timestamp."""
+    return {(run["device"], run["action"], run["time"]): run["next_run"] for run in next_runs}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_command_cached(text: str) -> Tuple[Optional[str], Mapping[str, Any]]:
+    """Parse a lower-cased command, memoizing results for repeated commands.
+
+    The device mapping is fixed at startup, so parsing is deterministic. Params
+    are stored read-only and must be copied by the caller before use.
+    """
+    command_type, params = parse_command(text)
+    return command_type, MappingProxyType(params)
+
 
 class WaterBot(commands.Bot):
     """Discord bot for controlling water devices via GPIO."""
@@ -34,6 +128,9 @@ class WaterBot(commands.Bot):
     # Class attribute to store help command for test access
     help_command = None
 
+    # Most recently created bot, used by the scheduler for notifications
+    _instance: ClassVar[Optional["WaterBot"]] = None
+
     def __init__(self) -> None:
         """Initialize the Discord bot for water control."""
         logger.debug("Initializing WaterBot Discord bot")
@@ -45,14 +142,27 @@ class WaterBot(commands.Bot):
 
         self.channel_id = int(DISCORD_CHANNEL_ID) if DISCORD_CHANNEL_ID else None
         self.target_channel: Optional[discord.TextChannel] = None
-
-        # Register this bot instance globally for notifications
-        set_bot_instance(self)
+        self._ip_cache: Optional[Tuple[float, Dict[str, str]]] = None
+        # Last status snapshot and its rendering; snapshots are only replaced
+        # when a device switches, so identity tells whether the text is current
+        self._status_render: Tuple[Optional[Mapping[str, bool]], str] = (None, "")
+        self._address_monitor: Optional[socket.socket] = None
+        self._inflight: Set["asyncio.Task[None]"] = set()
+        self._bot_thread: Optional[threading.Thread] = None
+        self._bot_error: Optional[Exception] = None
+
+        # Register this bot instance for notifications
+        WaterBot._instance = self
 
         # Add Discord commands
         self._setup_commands()
 
-        logger.info(f"Discord bot initialized for channel ID: {self.channel_id}")
+        logger.info("Discord bot initialized for channel ID: %s", self.channel_id)
+
+    @classmethod
+    def instance(cls) -> Optional["WaterBot"]:
+        """Get the current bot instance for sending notifications."""
+        return cls._instance
 
     def _setup_commands(self) -> None:
         """Set up Discord slash commands."""
@@ -61,10 +171,10 @@ class WaterBot(commands.Bot):
         async def on_command_func(ctx: commands.Context, device: str, timeout: Optional[int] = None) -> None:
             """Turn on a device."""
             if device.lower() == "all":
-                gpio_handler.turn_all_on()
+                await asyncio.to_thread(gpio_handler.turn_all_on)
                 await ctx.send("All devices turned ON")
             else:
-                success = gpio_handler.turn_on(device, timeout)
+                success = await asyncio.to_thread(gpio_handler.turn_on, device, timeout)
                 if success:
                     if timeout:
                         await ctx.send(f"Device '{device}' turned ON for {timeout} seconds")
@@ -76,7 +186,7 @@ class WaterBot(commands.Bot):
         @self.command(name="off")
         async def off_command_func(ctx: commands.Context, device: str, timeout: Optional[int] = None) -> None:
             """Turn off a device."""
-            success = gpio_handler.turn_off(device, timeout)
+            success = await asyncio.to_thread(gpio_handler.turn_off, device, timeout)
             if success:
                 if timeout:
                     await ctx.send(f"Device '{device}' turned OFF for {timeout} seconds")
@@ -95,12 +205,12 @@ class WaterBot(commands.Bot):
         async def schedules_command_func(ctx: commands.Context) -> None:
             """Show all schedules."""
             response = self._get_schedules_response()
-            await ctx.send(response)
+            await self._send_chunked(ctx, response)
 
         @self.command(name="schedule")
         async def schedule_command_func(ctx: commands.Context, device: str, action: str, time: str) -> None:
             """Add a schedule."""
-            success = scheduler.add_schedule(device, action, time)
+            success = await asyncio.to_thread(scheduler.add_schedule, device, action, time)
             if success:
                 await ctx.send(f"Added schedule: {device} {action} at {time}")
             else:
@@ -109,7 +219,7 @@ class WaterBot(commands.Bot):
         @self.command(name="unschedule")
         async def unschedule_command_func(ctx: commands.Context, device: str, action: str, time: str) -> None:
             """Remove a schedule."""
-            success = scheduler.remove_schedule(device, action, time)
+            success = await asyncio.to_thread(scheduler.remove_schedule, device, action, time)
             if success:
                 await ctx.send(f"Removed schedule: {device} {action} at {time}")
             else:
@@ -146,109 +256,146 @@ class WaterBot(commands.Bot):
         WaterBot.help_command = MockCommand(help_command_func)
 
     def _get_ip_addresses(self) -> Dict[str, str]:
-        """Get IP addresses for all network interfaces."""
-        ip_info = {}
+        """Get IP addresses for all network interfaces, cached for a short time."""
+        now = time.monotonic()
+        if self._ip_cache is not None and now - self._ip_cache[0] < IP_CACHE_TTL:
+            return dict(self._ip_cache[1])
+
+        ip_info = get_ip_addresses()
+        self._ip_cache = (now, ip_info)
+        return dict(ip_info)
+
+    def _on_address_change(self) -> None:
+        """Drop the cached IP addresses when the kernel reports an interface change."""
+        monitor = self._address_monitor
+        if monitor is None:
+            return
         try:
-            # Get all network interfaces except loopback
-            result = subprocess.run(["ls", "/sys/class/net/"], capture_output=True, text=True, check=True)  # nosec
-            interfaces = [iface for iface in result.stdout.strip().split() if iface != "lo"]
-
-            for interface in interfaces:
-                try:
-                    # Get IP address for this interface
-                    result = subprocess.run(  # nosec
-                        ["ip", "addr", "show", interface],
-                        capture_output=True,
-                        text=True,
-                        check=True,
-                    )
-
-                    # Parse IP address from output
-                    for line in result.stdout.split("\n"):
-                        if "inet " in line and "127.0.0.1" not in line:
-                            ip = line.strip().split()[1].split("/")[0]
-                            if ip:
-                                ip_info[interface] = ip
-                                break
-
-                except subprocess.CalledProcessError:
-                    continue
-
-        except subprocess.CalledProcessError:
-            logger.warning("Failed to get network interface information")
-
-        return ip_info
+            while monitor.recv(65536):
+                pass
+        except (BlockingIOError, InterruptedError):
+            pass
+        except OSError as e:
+            logger.warning("Netlink address monitor failed: %s", e)
+            self._stop_address_monitor()
+        self._ip_cache = None
+
+    def _stop_address_monitor(self) -> None:
+        """Unregister and close the netlink address monitor."""
+        monitor = self._address_monitor
+        if monitor is None:
+            return
+        self._address_monitor = None
+        try:
+            self.loop.remove_reader(monitor.fileno())
+        except (AttributeError, NotImplementedError, ValueError):
+            pass
+        monitor.close()
+
+    async def setup_hook(self) -> None:
+        """Watch for network address changes so the IP cache stays fresh."""
+        monitor = open_address_monitor()
+        if monitor is None:
+            return
+        try:
+            self.loop.add_reader(monitor.fileno(), self._on_address_change)
+        except NotImplementedError:
+            monitor.close()
+            return
+        self._address_monitor = monitor
+
+    async def close(self) -> None:
+        """Close the Discord connection, the address monitor and pending message handlers."""
+        self._stop_address_monitor()
+        inflight = [task for task in self._inflight if task is not asyncio.current_task()]
+        for task in inflight:
+            task.cancel()
+        if inflight:
+            await asyncio.gather(*inflight, return_exceptions=True)
+        await super().close()
 
     async def on_ready(self) -> None:
         """Get called when the bot is ready."""
-        logger.info(f"Discord bot logged in as {self.user}")
+        logger.info("Discord bot logged in as %s", self.user)
 
         if self.channel_id:
             self.target_channel = self.get_channel(self.channel_id)
             if self.target_channel:
-                logger.info(f"Connected to channel: {self.target_channel.name}")
+                logger.info("Connected to channel: %s", self.target_channel.name)
 
                 # Get IP address information
                 ip_info = self._get_ip_addresses()
 
-                startup_message = "WaterBot is now online! 💧\n"
-                if OPENAI_API_KEY:
-                    startup_message += "🤖 AI-powered conversational interface enabled!\n"
-                    startup_message += "Just chat with me naturally to control devices.\n\n"
-                else:
-                    startup_message += "Send `status` to check device status.\n"
-                    startup_message += "💡 Tip: Set OPENAI_API_KEY for conversational AI interface.\n\n"
-
+                parts = [_STARTUP_HEADER_AI if OPENAI_API_KEY else _STARTUP_HEADER_PLAIN]
                 if ip_info:
-                    startup_message += "📡 **SSH Access:**\n"
-                    for interface, ip in ip_info.items():
-                        startup_message += f"• `ssh pi@{ip}` (via {interface})\n"
+                    parts.append("📡 **SSH Access:**\n")
+                    parts.append(_format_ssh_lines(ip_info))
                 else:
-                    startup_message += "⚠️ No network interfaces found with IP addresses."
+                    parts.append("⚠️ No network interfaces found with IP addresses.")
 
-                await self.target_channel.send(startup_message)
+                await self.target_channel.send("".join(parts))
             else:
-                logger.error(f"Could not find channel with ID: {self.channel_id}")
+                logger.error("Could not find channel with ID: %s", self.channel_id)
 
     async def on_message(self, message: discord.Message) -> None:
         """Handle incoming Discord messages."""
+        # Only process messages from the target channel; most traffic is rejected
+        # here with a cheap integer comparison
+        if self.channel_id and message.channel.id != self.channel_id:
+            return
+
         # Ignore messages from the bot itself
         if message.author == self.user:
             return
 
-        # Only process messages from the target channel
-        if self.channel_id and message.channel.id != self.channel_id:
-            return
+        # Handle every message in its own task, so a command such as "off all" never
+        # waits for a slow OpenAI exchange; the tasks are tracked to cancel them on close
+        task = asyncio.create_task(self._process_message(message))
+        self._inflight.add(task)
+        task.add_done_callback(self._inflight.discard)
+
+    async def _process_message(self, message: discord.Message) -> None:
+        """Handle one message, logging failures instead of leaving them to the task."""
+        try:
+            await self._handle_message(message)
+        except Exception as e:
+            logger.error("Failed to handle message: %s", e, exc_info=True)
 
+    async def _handle_message(self, message: discord.Message) -> None:
+        """Respond to a message from the target channel."""
         # Process conversational messages with OpenAI if configured
         text = message.content.strip()
-        if text:
-            logger.info(f"Received message: {text}")
+        if not text:
+            return
 
-            if OPENAI_API_KEY:
-                # Use OpenAI for conversational interface with tool support
-                try:
-                    response = await process_with_openai(text)
-                    if response:
-                        logger.debug(f"Sending OpenAI response: {response}")
-                        await message.channel.send(response)
-                except Exception as e:
-                    logger.error(f"OpenAI processing failed: {e}", exc_info=True)
-                    # Fallback to command parser
-                    text_lower = text.lower()
-                    command_type, params = parse_command(text_lower)
-                    response = await self._execute_command(command_type, params)
-                    if response:
-                        logger.debug(f"Sending fallback response: {response}")
-                        await message.channel.send(response)
-            else:
-                # Fallback to legacy command parser if OpenAI not configured
-                text_lower = text.lower()
-                command_type, params = parse_command(text_lower)
-                response = await self._execute_command(command_type, params)
+        logger.info("Received message: %s", text)
+
+        if OPENAI_API_KEY:
+            # Use OpenAI for conversational interface with tool support
+            try:
+                response = await process_with_openai(text)
                 if response:
-                    logger.debug(f"Sending response: {response}")
-                    await message.channel.send(response)
+                    logger.debug("Sending OpenAI response: %s", response)
+                    await self._send_chunked(message.channel, response)
+                return
+            except Exception as e:
+                logger.error("OpenAI processing failed: %s", e, exc_info=True)
+                # Fall through to the command parser
+
+        # Legacy command parser, used when OpenAI is not configured or fails
+        # Commands are usually typed in lower case already; skip the copy then
+        command_type, cached_params = _parse_command_cached(text if text.islower() else text.lower())
+        response = await self._execute_command(command_type, dict(cached_params))
+        if response:
+            logger.debug("Sending response: %s", response)
+            await self._send_chunked(message.channel, response)
+
+    async def _send_chunked(self, destination: discord.abc.Messageable, text: str) -> None:
+        """Send text, split over several messages if it exceeds Discord's length limit."""
+        # Chunks are awaited one at a time on purpose: sending them concurrently
+        # lets Discord deliver them out of order, which garbles code blocks
+        for chunk in split_message(text):
+            await destination.send(chunk)
 
     async def _execute_command(self, command_type: Optional[str], params: dict) -> Optional[str]:
         """Execute a parsed command.
@@ -260,155 +407,138 @@ class WaterBot(commands.Bot):
         Returns:
             str: Response message
         """
-        if command_type == "status":
-            return self._get_status_response()
-
-        elif command_type == "show_schedules":
-            return self._get_schedules_response()
-
-        elif command_type == "show_device_schedules":
-            device = params["device"]
-            return self._get_device_schedules_response(device)
-
-        elif command_type == "schedule_add":
-            device = params["device"]
-            action = params["action"]
-            time_str = params["time"]
-            success = scheduler.add_schedule(device, action, time_str)
-            if success:
-                return f"Added schedule: {device} {action} at {time_str}"
-            else:
-                return f"Failed to add schedule for {device}"
-
-        elif command_type == "schedule_remove":
-            device = params["device"]
-            action = params["action"]
-            time_str = params["time"]
-            success = scheduler.remove_schedule(device, action, time_str)
-            if success:
-                return f"Removed schedule: {device} {action} at {time_str}"
-            else:
-                return f"No such schedule found: {device} {action} at {time_str}"
-
-        elif command_type == "all_on":
-            gpio_handler.turn_all_on()
-            return "All devices turned ON"
-
-        elif command_type == "all_off":
-            gpio_handler.turn_all_off()
-            return "All devices turned OFF"
-
-        elif command_type == "device_on":
-            device = params["device"]
-            timeout = params.get("timeout")
-            success = gpio_handler.turn_on(device, timeout)
-            if success:
-                time_msg = f" for {timeout // 60} minutes" if timeout else ""
-                return f"Device '{device}' turned ON{time_msg}"
-            else:
-                return f"Error: Unknown device '{device}'"
-
-        elif command_type == "device_off":
-            device = params["device"]
-            timeout = params.get("timeout")
-            success = gpio_handler.turn_off(device, timeout)
-            if success:
-                if timeout:
-                    return f"Device '{device}' turned OFF for {timeout} seconds"
-                else:
-                    return f"Device '{device}' turned OFF permanently"
+        handler = self._COMMAND_HANDLERS.get(command_type) if command_type else None
+        if handler is None:
+            return "Unknown command. Send 'help' for available commands."
+        return await handler(self, params)
+
+    async def _handle_status(self, params: dict) -> Optional[str]:
+        """Handle the status command."""
+        return self._get_status_response()
+
+    async def _handle_show_schedules(self, params: dict) -> Optional[str]:
+        """Handle the schedules command."""
+        return self._get_schedules_response()
+
+    async def _handle_show_device_schedules(self, params: dict) -> Optional[str]:
+        """Handle the device-specific schedules command."""
+        device = params["device"]
+        return self._get_device_schedules_response(device)
+
+    async def _handle_schedule_add(self, params: dict) -> Optional[str]:
+        """Handle the schedule add command."""
+        device = params["device"]
+        action = params["action"]
+        time_str = params["time"]
+        success = await asyncio.to_thread(scheduler.add_schedule, device, action, time_str)
+        if success:
+            return f"Added schedule: {device} {action} at {time_str}"
+        else:
+            return f"Failed to add schedule for {device}"
+
+    async def _handle_schedule_remove(self, params: dict) -> Optional[str]:
+        """Handle the schedule remove command."""
+        device = params["device"]
+        action = params["action"]
+        time_str = params["time"]
+        success = await asyncio.to_thread(scheduler.remove_schedule, device, action, time_str)
+        if success:
+            return f"Removed schedule: {device} {action} at {time_str}"
+        else:
+            return f"No such schedule found: {device} {action} at {time_str}"
+
+    async def _handle_all_on(self, params: dict) -> Optional[str]:
+        """Handle the all devices on command."""
+        await asyncio.to_thread(gpio_handler.turn_all_on)
+        return "All devices turned ON"
+
+    async def _handle_all_off(self, params: dict) -> Optional[str]:
+        """Handle the all devices off command."""
+        await asyncio.to_thread(gpio_handler.turn_all_off)
+        return "All devices turned OFF"
+
+    async def _handle_device_on(self, params: dict) -> Optional[str]:
+        """Handle the device on command."""
+        device = params["device"]
+        timeout = params.get("timeout")
+        success = await asyncio.to_thread(gpio_handler.turn_on, device, timeout)
+        if success:
+            time_msg = f" for {timeout // 60} minutes" if timeout else ""
+            return f"Device '{device}' turned ON{time_msg}"
+        else:
+            return f"Error: Unknown device '{device}'"
+
+    async def _handle_device_off(self, params: dict) -> Optional[str]:
+        """Handle the device off command."""
+        device = params["device"]
+        timeout = params.get("timeout")
+        success = await asyncio.to_thread(gpio_handler.turn_off, device, timeout)
+        if success:
+            if timeout:
+                return f"Device '{device}' turned OFF for {timeout} seconds"
             else:
-                return f"Error: Unknown device '{device}'"
-
-        elif command_type == "error":
-            return str(params["message"])
-
-        elif command_type == "test":
-            # Execute test notification
-            from .. import scheduler
-
-            scheduler_instance = scheduler.get_scheduler()
-            scheduler_instance._send_discord_notification("test_device", "on", True)
-            return "💧 **Test Notification** - Test via plain text command completed"
+                return f"Device '{device}' turned OFF permanently"
+        else:
+            return f"Error: Unknown device '{device}'"
 
-        elif command_type == "time":
-            # Execute time command
-            from datetime import datetime
+    async def _handle_error(self, params: dict) -> Optional[str]:
+        """Handle a parser error."""
+        return str(params["message"])
 
-            current_time = datetime.now()
-            response = f"🕐 **Current Time:** {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}"
+    async def _handle_test(self, params: dict) -> Optional[str]:
+        """Handle the test notification command."""
+        scheduler_instance = scheduler.get_scheduler()
+        scheduler_instance._send_discord_notification("test_device", "on", True)
+        return "💧 **Test Notification** - Test via plain text command completed"
 
-            # Also show timezone info if available
-            try:
-                import subprocess  # nosec B404
-
-                tz_result = subprocess.run(  # nosec B603, B607
-                    ["timedatectl", "show", "--property=Timezone", "--value"],
-                    capture_output=True,
-                    text=True,
-                    timeout=5,
-                )
-                if tz_result.returncode == 0 and tz_result.stdout.strip():
-                    timezone = tz_result.stdout.strip()
-                    response += f"\n📍 **Timezone:** {timezone}"
-            except (
-                subprocess.CalledProcessError,
-                subprocess.TimeoutExpired,
-                FileNotFoundError,
-            ):
-                # timedatectl not available or failed, try alternative
-                try:
-                    import time
+    async def _handle_time(self, params: dict) -> Optional[str]:
+        """Handle the time command."""
+        from datetime import datetime
 
-                    response += f"\n📍 **Timezone:** {time.tzname[time.daylight]}"
-                except Exception:  # nosec B110
-                    pass
+        current_time = datetime.now()
+        response = f"🕐 **Current Time:** {current_time.strftime('%Y-%m-%d %H:%M:%S %Z')}"
 
-            return response
+        # Also show timezone info if available
+        timezone = get_timezone_name()
+        if timezone:
+            response += f"\n📍 **Timezone:** {timezone}"
 
-        elif command_type == "ip":
-            # Execute ip command
-            ip_info = self._get_ip_addresses()
-
-            if ip_info:
-                response = "📡 **SSH Access Information:**\n\n"
-                for interface, ip in ip_info.items():
-                    response += f"• `ssh pi@{ip}` (via {interface})\n"
-            else:
-                response = "⚠️ No network interfaces found with IP addresses.\n" "Please check your network connection."
-
-            return response
+        return response
 
-        elif command_type == "help":
-            return self._get_help_response()
-
-        else:
-            return "Unknown command. Send 'help' for available commands."
+    async def _handle_ip(self, params: dict) -> Optional[str]:
+        """Handle the ip command."""
+        ip_info = self._get_ip_addresses()
+
+        if not ip_info:
+            return "⚠️ No network interfaces found with IP addresses.\n" "Please check your network connection."
+
+        return "📡 **SSH Access Information:**\n\n" + _format_ssh_lines(ip_info)
+
+    async def _handle_help(self, params: dict) -> Optional[str]:
+        """Handle the help command."""
+        return self._get_help_response()
+
+    # Dispatch table from parsed command type to handler, built once at class creation
+    _COMMAND_HANDLERS: Dict[str, Callable[["WaterBot", dict], Awaitable[Optional[str]]]] = {
+        "status": _handle_status,
+        "show_schedules": _handle_show_schedules,
+        "show_device_schedules": _handle_show_device_schedules,
+        "schedule_add": _handle_schedule_add,
+        "schedule_remove": _handle_schedule_remove,
+        "all_on": _handle_all_on,
+        "all_off": _handle_all_off,
+        "device_on": _handle_device_on,
+        "device_off": _handle_device_off,
+        "error": _handle_error,
+        "test": _handle_test,
+        "time": _handle_time,
+        "ip": _handle_ip,
+        "help": _handle_help,
+    }
 
     def _get_help_response(self) -> str:
         """Generate help response message."""
-        return (
-            "**Available commands:**\n"
-            "```\n"
-            "status - Show status of all devices\n"
-            "on <device> [minutes] - Turn on a device\n"
-            "off <device> [minutes] - Turn off a device\n"
-            "on all - Turn on all devices\n"
-            "off all - Turn off all devices\n"
-            "schedules - Show all schedules\n"
-            "schedule for <device> - Show schedules for specific device\n"
-            "schedule <device> <on|off> <HH:MM> - Add schedule\n"
-            "unschedule <device> <on|off> <HH:MM> - Remove schedule\n"
-            "time - Show current time on bot node\n"
-            "ip - Show SSH access information\n"
-            "test - Test notification system\n"
-            "```\n"
-            + (
-                "💡 Tip: Set OPENAI_API_KEY for conversational AI interface."
-                if not OPENAI_API_KEY
-                else "🤖 AI-powered conversational interface enabled!"
-            )
-        )
+        return _HELP_AI if OPENAI_API_KEY else _HELP_PLAIN
 
     def _get_schedules_response(self) -> str:
         """Generate schedules response message."""
@@ -416,22 +546,27 @@ class WaterBot(commands.Bot):
         if not schedules:
             return "No schedules configured"
 
-        response = "**Device Schedules:**\n```\n"
+        next_runs = scheduler.get_next_runs()
+        next_by_entry = _index_next_runs(next_runs)
+
+        parts = ["**Device Schedules:**\n```\n"]
         for device, actions in schedules.items():
-            response += f"{device.upper()}:\n"
+            parts.append(f"{device.upper()}:\n")
             for action, times in actions.items():
+                action_upper = action.upper()
                 for time_str in times:
-                    response += f"  {action.upper()} at {time_str}\n"
+                    next_run = next_by_entry.get((device, action, time_str))
+                    next_text = f" (next: {next_run})" if next_run else ""
+                    parts.append(f"  {action_upper} at {time_str}{next_text}\n")
 
-        # Add next runs information
-        next_runs = scheduler.get_next_runs()
+        # Add the soonest runs across all devices
         if next_runs:
-            response += "\nNext scheduled runs:\n"
+            parts.append("\nNext scheduled runs:\n")
             for run in next_runs[:5]:  # Show next 5 runs
-                response += f"  {run['device']} {run['action']} at {run['time']} " f"(next: {run['next_run']})\n"
+                parts.append(f"  {run['device']} {run['action']} at {run['time']} (next: {run['next_run']})\n")
 
-        response += "```"
-        return response
+        parts.append("```")
+        return "".join(parts)
 
     def _get_device_schedules_response(self, device: str) -> str:
         """Generate schedules response message for a specific device."""
@@ -439,22 +574,18 @@ class WaterBot(commands.Bot):
         if not schedules:
             return f"No schedules configured for device '{device}'"
 
-        response = f"**Schedules for {device.upper()}:**\n```\n"
+        next_by_entry = _index_next_runs(scheduler.get_next_runs())
+
+        parts = [f"**Schedules for {device.upper()}:**\n```\n"]
         for action, times in schedules.items():
+            action_upper = action.upper()
             for time_str in times:
-                response += f"  {action.upper()} at {time_str}\n"
+                next_run = next_by_entry.get((device, action, time_str))
+                next_text = f" (next: {next_run})" if next_run else ""
+                parts.append(f"  {action_upper} at {time_str}{next_text}\n")
 
-        # Add next runs information for this device
-        next_runs = scheduler.get_next_runs()
-        if next_runs:
-            device_runs = [run for run in next_runs if run["device"].lower() == device.lower()]
-            if device_runs:
-                response += f"\nNext scheduled runs for {device}:\n"
-                for run in device_runs[:5]:  # Show next 5 runs for this device
-                    response += f"  {run['action']} at {run['time']} (next: {run['next_run']})\n"
-
-        response += "```"
-        return response
+        parts.append("```")
+        return "".join(parts)
 
     def _get_status_response(self) -> str:
         """Generate status response message.
@@ -466,16 +597,21 @@ class WaterBot(commands.Bot):
         if not status:
             return "No devices configured"
 
-        response = "**Device Status:**\n```\n"
-        for device, is_on in status.items():
-            status_text = "ON" if is_on else "OFF"
-            response += f"- {device}: {status_text}\n"
+        rendered_for, text = self._status_render
+        if rendered_for is status:
+            return text
 
-        response += "```"
-        return response
+        lines = "".join(f"- {device}: {'ON' if is_on else 'OFF'}\n" for device, is_on in status.items())
+        text = f"**Device Status:**\n```\n{lines}```"
+        self._status_render = (status, text)
+        return text
 
     def start_bot(self) -> None:
-        """Start the Discord bot."""
+        """Start the Discord bot and block until it stops.
+
+        The client runs on its own thread so stop_bot() can close it from the
+        main thread (e.g. a signal handler) while GPIO cleanup proceeds.
+        """
         logger.info("Starting Discord bot")
         try:
             if not DISCORD_BOT_TOKEN:
@@ -484,29 +620,52 @@ class WaterBot(commands.Bot):
                 raise ValueError("Discord channel ID not configured")
 
             logger.info("Attempting to connect to Discord...")
-            self.run(DISCORD_BOT_TOKEN)
+            self._bot_error = None
+            self._bot_thread = threading.Thread(
+                target=self._run_client, args=(DISCORD_BOT_TOKEN,), name="discord-bot", daemon=True
+            )
+            self._bot_thread.start()
+
+            # Join with a timeout so the main thread keeps handling signals
+            while self._bot_thread.is_alive():
+                self._bot_thread.join(timeout=1)
+
+            if self._bot_error is not None:
+                raise self._bot_error
         except Exception as e:
-            logger.error(f"Error starting Discord bot: {e}", exc_info=True)
+            logger.error("Error starting Discord bot: %s", e, exc_info=True)
             raise
 
+    def _run_client(self, token: str) -> None:
+        """Run the Discord client, recording any error for start_bot()."""
+        try:
+            self.run(token)
+        except Exception as e:
+            self._bot_error = e
+
     def stop_bot(self) -> None:
         """Stop the Discord bot."""
         logger.info("Stopping Discord bot")
+        thread = self._bot_thread
+        if thread is not None and thread.is_alive() and thread is not threading.current_thread():
+            loop = self.loop
+            if isinstance(loop, asyncio.AbstractEventLoop) and not loop.is_closed():
+                try:
+                    asyncio.run_coroutine_threadsafe(self.close(), loop).result(timeout=10)
+                except Exception as e:
+                    logger.error("Error closing Discord connection: %s", e)
+            thread.join(timeout=5)
+
         # Clean up GPIO
         gpio_handler.cleanup()
         logger.info("Bot stopped")
 
 
-# Global bot instance for notifications
-_bot_instance: Optional[WaterBot] = None
-
-
 def get_bot_instance() -> Optional[WaterBot]:
     """Get the current bot instance for sending notifications."""
-    return _bot_instance
+    return WaterBot.instance()
 
 
 def set_bot_instance(bot: WaterBot) -> None:
     """Set the bot instance for notifications."""
-    global _bot_instance
-    _bot_instance = bot
+    WaterBot._instance = bot
@@ -1,24 +1,67 @@
 """GPIO device control and management for WaterBot."""
 
+import functools
 import logging
-from threading import Lock, Timer
-from typing import Dict, Optional
+from contextlib import ExitStack
+from threading import Lock
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Optional, Tuple
 
 from ..config import DEVICE_TO_PIN, IS_EMULATION
 from .interface import EmulationGPIO, GPIOInterface, HardwareGPIO  # noqa: I100
+from .timers import TimerQueue
 
 logger = logging.getLogger("gpio_handler")
 
 
+def _no_output(value: bool) -> None:
+    """Stand-in pin writer used when no GPIO interface is available."""
+
+
+class _Device:
+    """Per-device bindings resolved once at setup for the switching path."""
+
+    __slots__ = ("pin", "lock", "output")
+
+    def __init__(self, pin: int, output: Callable[[bool], None]) -> None:
+        """Bind a device to its pin and pin writer."""
+        self.pin = pin
+        # One lock per device: switching different pins never contends
+        self.lock = Lock()
+        self.output = output
+
+
 class DeviceController:
     """Controls GPIO devices with proper abstraction for testing."""
 
+    __slots__ = (
+        "gpio",
+        "device_status",
+        "_status_version",
+        "_status_snapshot",
+        "_status_lock",
+        "device_timers",
+        "timers",
+        "devices",
+        "device_items",
+        "device_pins",
+    )
+
     def __init__(self, gpio_interface: Optional[GPIOInterface] = None):
         """Initialize the device controller."""
         self.gpio = gpio_interface
         self.device_status: Dict[str, bool] = {}
-        self.device_timers: Dict[str, Optional[Timer]] = {}
-        self.gpio_lock = Lock()
+        # get_status() snapshot, reused until the status changes (copy-on-write)
+        self._status_version = 0
+        self._status_snapshot: Tuple[int, Mapping[str, bool]] = (-1, MappingProxyType({}))
+        # Orders status writes against snapshot rebuilds across device locks
+        self._status_lock = Lock()
+        self.device_timers: Dict[str, Optional[int]] = {}
+        self.timers = TimerQueue()
+        self.devices: Dict[str, _Device] = {}
+        # Snapshot of (device, pin) pairs; the configuration is fixed after startup
+        self.device_items: Tuple[Tuple[str, int], ...] = ()
+        self.device_pins: Tuple[int, ...] = ()
 
         # Initialize GPIO if not provided
         if self.gpio is None:
@@ -40,7 +83,7 @@ class DeviceController:
                 self.gpio = HardwareGPIO()
                 logger.info("GPIO initialized in hardware mode (previous state cleaned)")
             except (ImportError, RuntimeError) as e:
-                logger.error(f"Failed to initialize GPIO in hardware mode: {e}")
+                logger.error("Failed to initialize GPIO in hardware mode: %s", e)
                 raise
         else:
             self.gpio = EmulationGPIO()
@@ -48,14 +91,18 @@ class DeviceController:
 
     def _setup_devices(self) -> None:
         """Set up all configured devices."""
-        for device, pin in DEVICE_TO_PIN.items():
+        self.device_items = tuple(DEVICE_TO_PIN.items())
+        self.device_pins = tuple(pin for _, pin in self.device_items)
+        for device, pin in self.device_items:
             if self.gpio is not None:
                 self.gpio.setup(pin, "OUT")
                 self.gpio.output(pin, False)
             self.device_status[device] = False
             self.device_timers[device] = None
+            output = functools.partial(self.gpio.output, pin) if self.gpio is not None else _no_output
+            self.devices[device] = _Device(pin, output)
 
-        logger.info(f"Setup {len(DEVICE_TO_PIN)} devices")
+        logger.info("Setup %d devices", len(self.device_items))
 
     def turn_on(self, device: str, timeout: Optional[int] = None) -> bool:
         """Turn on a device by setting GPIO pin HIGH (for low-activated relays).
@@ -67,34 +114,34 @@ class DeviceController:
         Returns:
             bool: True if successful, False if device not found
         """
-        if device not in DEVICE_TO_PIN:
-            logger.warning(f"Unknown device: {device}")
+        rec = self.devices.get(device)
+        if rec is None:
+            logger.warning("Unknown device: %s", device)
             return False
 
-        with self.gpio_lock:
+        pin = rec.pin
+        with rec.lock:
             # Cancel any existing timer
             timer = self.device_timers[device]
             if timer is not None:
-                timer.cancel()
+                self.timers.cancel(timer)
                 self.device_timers[device] = None
 
             # Turn on the device (set pin HIGH for low-activated relays)
-            pin = DEVICE_TO_PIN[device]
-            if self.gpio is not None:
-                self.gpio.output(pin, True)  # HIGH = ON
-            self.device_status[device] = True
-
-            if IS_EMULATION:
-                logger.info(f"EMULATION: Turning ON device '{device}' on pin {pin}")
+            rec.output(True)  # HIGH = ON
+            with self._status_lock:
+                self.device_status[device] = True
+                self._status_version += 1
 
             # Set a timer if timeout is specified
             if timeout:
-                self.device_timers[device] = Timer(timeout, lambda: self.turn_off(device))
-                timer = self.device_timers[device]
-                if timer is not None:
-                    timer.daemon = True
-                    timer.start()
-                logger.info(f"Device '{device}' will turn off after {timeout // 60} minutes")
+                self.device_timers[device] = self.timers.schedule(timeout, lambda: self.turn_off(device))
+
+        # Log outside the lock so slow log handlers never delay other switches
+        if IS_EMULATION:
+            logger.info("EMULATION: Turning ON device '%s' on pin %d", device, pin)
+        if timeout:
+            logger.info("Device '%s' will turn off after %d minutes", device, timeout // 60)
 
         return True
 
@@ -108,70 +155,117 @@ class DeviceController:
         Returns:
             bool: True if successful, False if device not found
         """
-        if device not in DEVICE_TO_PIN:
-            logger.warning(f"Unknown device: {device}")
+        rec = self.devices.get(device)
+        if rec is None:
+            logger.warning("Unknown device: %s", device)
             return False
 
-        with self.gpio_lock:
+        pin = rec.pin
+        with rec.lock:
             # Cancel any existing timer
             timer = self.device_timers[device]
             if timer is not None:
-                timer.cancel()
+                self.timers.cancel(timer)
                 self.device_timers[device] = None
 
             # Turn off the device (set pin LOW for low-activated relays)
-            pin = DEVICE_TO_PIN[device]
-            if self.gpio is not None:
-                self.gpio.output(pin, False)  # LOW = OFF
-            self.device_status[device] = False
-
-            if IS_EMULATION:
-                logger.info(f"EMULATION: Turning OFF device '{device}' on pin {pin}")
+            rec.output(False)  # LOW = OFF
+            with self._status_lock:
+                self.device_status[device] = False
+                self._status_version += 1
 
             # Set a timer if timeout is specified
             if timeout:
-                self.device_timers[device] = Timer(timeout, lambda: self.turn_on(device))
-                timer = self.device_timers[device]
-                if timer is not None:
-                    timer.daemon = True
-                    timer.start()
-                logger.info(f"Device '{device}' will turn on after {timeout // 60} minutes")
-            else:
-                logger.info(f"Device '{device}' turned off permanently")
+                self.device_timers[device] = self.timers.schedule(timeout, lambda: self.turn_on(device))
+
+        # Log outside the lock so slow log handlers never delay other switches
+        if IS_EMULATION:
+            logger.info("EMULATION: Turning OFF device '%s' on pin %d", device, pin)
+        if timeout:
+            logger.info("Device '%s' will turn on after %d minutes", device, timeout // 60)
+        else:
+            logger.info("Device '%s' turned off permanently", device)
 
         return True
 
-    def get_status(self) -> Dict[str, bool]:
-        """Get status of all devices."""
-        return self.device_status.copy()
+    def get_status(self) -> Mapping[str, bool]:
+        """Get a read-only snapshot of the status of all devices.
+
+        The snapshot is only rebuilt after a device changed state, so repeated
+        reads while nothing switches share one copy.
+        """
+        with self._status_lock:
+            version, snapshot = self._status_snapshot
+            if version != self._status_version:
+                snapshot = MappingProxyType(dict(self.device_status))
+                self._status_snapshot = (self._status_version, snapshot)
+        return snapshot
+
+    def _set_all(self, state: bool, timeout: Optional[int] = None) -> bool:
+        """Switch every device to the same state in one critical section.
+
+        All device locks are taken in configuration order, so the batch cannot
+        interleave with single-device switches or deadlock against them.
+
+        Args:
+            state: True to turn devices on, False to turn them off
+            timeout: Optional timeout in seconds after which each device is
+                switched back
+
+        Returns:
+            bool: Always True, since only configured devices are switched
+        """
+        with ExitStack() as stack:
+            for device, _ in self.device_items:
+                stack.enter_context(self.devices[device].lock)
+
+            for device, _ in self.device_items:
+                # Cancel any existing timer
+                timer = self.device_timers.get(device)
+                if timer is not None:
+                    self.timers.cancel(timer)
+                    self.device_timers[device] = None
+
+            # Write every pin in one backend call
+            if self.gpio is not None and self.device_pins:
+                self.gpio.output_many(self.device_pins, (state,) * len(self.device_pins))
+
+            with self._status_lock:
+                for device, _ in self.device_items:
+                    self.device_status[device] = state
+                self._status_version += 1
+
+            if timeout:
+                revert = self.turn_off if state else self.turn_on
+                for device, _ in self.device_items:
+                    self.device_timers[device] = self.timers.schedule(timeout, functools.partial(revert, device))
+
+        if IS_EMULATION:
+            logger.info("EMULATION: Turning %s all %d devices", "ON" if state else "OFF", len(self.device_items))
+        if timeout:
+            logger.info("All devices will turn %s after %d minutes", "off" if state else "on", timeout // 60)
+
+        return True
 
     def turn_all_on(self, timeout: Optional[int] = None) -> bool:
         """Turn on all devices."""
-        success = True
-        for device in DEVICE_TO_PIN.keys():
-            if not self.turn_on(device, timeout):
-                success = False
-        return success
+        return self._set_all(True, timeout)
 
     def turn_all_off(self, timeout: Optional[int] = None) -> bool:
         """Turn off all devices."""
-        success = True
-        for device in DEVICE_TO_PIN.keys():
-            if not self.turn_off(device, timeout):
-                success = False
-        return success
+        return self._set_all(False, timeout)
 
     def cleanup(self) -> None:
         """Clean up GPIO resources."""
         # Cancel all timers
-        for device in self.device_timers:
-            timer = self.device_timers[device]
-            if timer is not None:
-                timer.cancel()
+        self.timers.cancel_all()
 
         # Turn off all devices before cleanup
-        for device in DEVICE_TO_PIN.keys():
-            self.device_status[device] = False
+        with self._status_lock:
+            for device, _ in self.device_items:
+                self.device_timers[device] = None
+                self.device_status[device] = False
+            self._status_version += 1
 
         # Cleanup GPIO
         if self.gpio:
@@ -182,21 +276,30 @@ class DeviceController:
 
 # Global device controller instance
 _controller: Optional[DeviceController] = None
+# Guards creation of the global controller; the scheduler thread and the Discord
+# bot may both make the first request
+_controller_lock = Lock()
 
 
 def _get_controller() -> DeviceController:
     """Get the global device controller instance."""
     global _controller
-    if _controller is None:
-        logger.info("Initializing new GPIO controller instance")
-        _controller = DeviceController()
-    return _controller
+    controller = _controller
+    if controller is not None:
+        return controller
+
+    with _controller_lock:
+        if _controller is None:
+            logger.info("Initializing new GPIO controller instance")
+            _controller = DeviceController()
+        return _controller
 
 
 def set_controller(controller: DeviceController) -> None:
     """Set a custom controller (for testing)."""
     global _controller
-    _controller = controller
+    with _controller_lock:
+        _controller = controller
 
 
 # Backward compatibility functions
@@ -210,7 +313,7 @@ def turn_off(device: str, timeout: Optional[int] = None) -> bool:
     return _get_controller().turn_off(device, timeout)
 
 
-def get_status() -> Dict[str, bool]:
+def get_status() -> Mapping[str, bool]:
     """Get status of all devices."""
     return _get_controller().get_status()
 
@@ -1,7 +1,7 @@
 """GPIO interface abstractions for WaterBot."""
 
 from abc import ABC, abstractmethod
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Set, Tuple
 
 
 class GPIOInterface(ABC):
@@ -17,6 +17,18 @@ class GPIOInterface(ABC):
         """Set GPIO pin output value."""
         pass
 
+    def output_many(self, pins: Sequence[int], values: Sequence[bool]) -> None:
+        """Set several GPIO pin output values.
+
+        Backends that can write several channels in one call override this.
+
+        Args:
+            pins: Pins to write
+            values: Output value for each pin
+        """
+        for pin, value in zip(pins, values):
+            self.output(pin, value)
+
     @abstractmethod
     def cleanup(self) -> None:
         """Cleanup GPIO resources."""
@@ -34,6 +46,15 @@ class HardwareGPIO(GPIOInterface):
             self.GPIO = GPIO
             self.GPIO.setmode(GPIO.BCM)  # Use BCM pin numbers
             self.GPIO.setwarnings(False)
+
+            # Bind constants and functions used on every switch
+            self._HIGH = GPIO.HIGH
+            self._LOW = GPIO.LOW
+            self._output = GPIO.output
+            # Only cleanup() can reset the numbering mode once it is set here
+            self._mode_ok = True
+            # Pins configured as outputs, so output() needs no exception fallback
+            self._pins_setup: Set[int] = set()
         except (ImportError, RuntimeError) as e:
             if "This module can only be run on a Raspberry Pi!" in str(e):
                 raise RuntimeError("RPi.GPIO not available")
@@ -41,38 +62,54 @@ class HardwareGPIO(GPIOInterface):
 
     def setup(self, pin: int, mode: str) -> None:
         """Set up a GPIO pin."""
-        self._ensure_mode_set()
+        if not self._mode_ok:
+            self._ensure_mode_set()
         gpio_mode = self.GPIO.OUT if mode == "OUT" else self.GPIO.IN
         try:
             self.GPIO.setup(pin, gpio_mode)
         except RuntimeError:
             # Clean up and retry once
             self.GPIO.cleanup()
+            self._pins_setup.clear()
             self.GPIO.setmode(self.GPIO.BCM)
             self.GPIO.setwarnings(False)
             self.GPIO.setup(pin, gpio_mode)
+        if mode == "OUT":
+            self._pins_setup.add(pin)
+        else:
+            self._pins_setup.discard(pin)
 
     def output(self, pin: int, value: bool) -> None:
         """Set GPIO pin output value."""
-        self._ensure_mode_set()
-        gpio_value = self.GPIO.HIGH if value else self.GPIO.LOW
-        try:
-            self.GPIO.output(pin, gpio_value)
-        except RuntimeError:
-            # Pin might not be set up, try to set it up as OUTPUT first
-            self.GPIO.setup(pin, self.GPIO.OUT)
-            self.GPIO.output(pin, gpio_value)
+        if not self._mode_ok:
+            self._ensure_mode_set()
+        if pin not in self._pins_setup:
+            # Pin not set up yet (or cleaned up), set it up as OUTPUT first
+            self.setup(pin, "OUT")
+        self._output(pin, self._HIGH if value else self._LOW)
+
+    def output_many(self, pins: Sequence[int], values: Sequence[bool]) -> None:
+        """Set several GPIO pin output values with one RPi.GPIO call."""
+        if not self._mode_ok:
+            self._ensure_mode_set()
+        high, low = self._HIGH, self._LOW
+        channels = list(pins)
+        for pin in channels:
+            if pin not in self._pins_setup:
+                self.setup(pin, "OUT")
+        self._output(channels, [high if value else low for value in values])
 
     def _ensure_mode_set(self) -> None:
-        """Ensure GPIO mode is set before operations."""
-        if self.GPIO.getmode() is None:
-            # Mode not set, set it to BOARD
-            self.GPIO.setmode(self.GPIO.BCM)
-            self.GPIO.setwarnings(False)
+        """Restore the BCM numbering mode after a cleanup."""
+        self.GPIO.setmode(self.GPIO.BCM)
+        self.GPIO.setwarnings(False)
+        self._mode_ok = True
 
     def cleanup(self) -> None:
         """Cleanup GPIO resources."""
         self.GPIO.cleanup()
+        self._mode_ok = False
+        self._pins_setup.clear()
 
 
 class EmulationGPIO(GPIOInterface):
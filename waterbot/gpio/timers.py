@@ -0,0 +1,92 @@
+"""Shared timer thread for delayed GPIO actions."""
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+from typing import Callable, List, Optional, Set, Tuple
+
+logger = logging.getLogger("gpio_handler")
+
+# Number of cancelled entries tolerated in the heap before it is compacted
+_COMPACT_SLACK = 32
+
+
+class TimerQueue:
+    """Runs delayed callbacks on a single background thread.
+
+    Device timeouts are kept in a min-heap ordered by deadline, so any number
+    of pending timeouts costs one thread instead of one threading.Timer each.
+    """
+
+    def __init__(self, name: str = "gpio-timers") -> None:
+        """Initialize an empty timer queue; the worker thread starts on first use."""
+        self._name = name
+        self._heap: List[Tuple[float, int, Callable[[], object]]] = []
+        self._pending: Set[int] = set()
+        self._ids = itertools.count(1)
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def schedule(self, delay: float, callback: Callable[[], object]) -> int:
+        """Run a callback after a delay.
+
+        Args:
+            delay: Seconds to wait before running the callback
+            callback: Function to call on the timer thread
+
+        Returns:
+            int: Handle that can be passed to cancel()
+        """
+        with self._condition:
+            handle = next(self._ids)
+            heapq.heappush(self._heap, (time.monotonic() + delay, handle, callback))
+            self._pending.add(handle)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+            self._condition.notify()
+        return handle
+
+    def cancel(self, handle: int) -> None:
+        """Cancel a pending callback; does nothing if it already ran."""
+        with self._condition:
+            # The heap entry is skipped lazily once it reaches the top
+            self._pending.discard(handle)
+            # Devices toggled repeatedly with long timeouts leave many stale entries
+            # behind; rebuild the heap once they outnumber the live ones
+            if len(self._heap) > 2 * len(self._pending) + _COMPACT_SLACK:
+                self._heap = [entry for entry in self._heap if entry[1] in self._pending]
+                heapq.heapify(self._heap)
+
+    def cancel_all(self) -> None:
+        """Cancel every pending callback."""
+        with self._condition:
+            self._pending.clear()
+            self._heap.clear()
+            self._condition.notify()
+
+    def _run(self) -> None:
+        """Wait for the earliest deadline and run its callback."""
+        while True:
+            with self._condition:
+                while True:
+                    while self._heap and self._heap[0][1] not in self._pending:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._condition.wait()
+                        continue
+
+                    deadline, handle, callback = self._heap[0]
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        heapq.heappop(self._heap)
+                        self._pending.discard(handle)
+                        break
+                    self._condition.wait(remaining)
+
+            try:
+                callback()
+            except Exception as e:
+                logger.error("Device timer callback failed: %s", e, exc_info=True)
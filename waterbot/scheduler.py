@@ -1,18 +1,39 @@
 """Device scheduling system for WaterBot."""
 
+import asyncio
+import concurrent.futures
+import functools
 import logging
 import threading
-import time
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
 import schedule
 
+from . import config
 from .config import DEVICE_SCHEDULES, ENABLE_SCHEDULING
 from .gpio import handler as gpio_handler
 
 logger = logging.getLogger("scheduler")
 
+# Longest the scheduler thread sleeps before re-checking its jobs. Job times are
+# wall-clock based, and a Pi without an RTC can see its clock jump (NTP sync),
+# so the thread never trusts a computed wait for longer than this.
+_MAX_IDLE_SECONDS = 60
+
+
+class _JobEntry:
+    """A registered schedule and the `schedule` job that runs it."""
+
+    __slots__ = ("device", "action", "time", "job")
+
+    def __init__(self, device: str, action: str, time_str: str, job: schedule.Job) -> None:
+        """Bind a schedule entry to its job."""
+        self.device = device
+        self.action = action
+        self.time = time_str
+        self.job = job
+
 
 class DeviceScheduler:
     """Handles scheduled device operations."""
@@ -21,10 +42,18 @@ class DeviceScheduler:
         """Initialize the device scheduler."""
         self.running = False
         self.scheduler_thread: Optional[threading.Thread] = None
-        self.scheduled_jobs: List[Dict[str, Any]] = []
+        # Job records keyed by (device, action, time), so removal is a lookup
+        self.scheduled_jobs: Dict[Tuple[str, str, str], _JobEntry] = {}
+        # Wakes the scheduler thread early when jobs change or it should stop
+        self._wake = threading.Event()
 
     def setup_schedules(self) -> None:
-        """Set up all scheduled tasks based on configuration."""
+        """Set up all scheduled tasks based on configuration.
+
+        This rebuilds every job and is only meant for startup; schedule edits go
+        through add_schedule, remove_schedule and replace_schedules, which only
+        touch the affected jobs.
+        """
         # Clear existing schedules first
         schedule.clear()
         self.scheduled_jobs.clear()
@@ -38,7 +67,7 @@ class DeviceScheduler:
                 for time_str in times:
                     self._schedule_device_action(device, action, time_str)
 
-        logger.info(f"Set up {len(self.scheduled_jobs)} scheduled tasks")
+        logger.info("Set up %d scheduled tasks", len(self.scheduled_jobs))
 
     def _schedule_device_action(self, device: str, action: str, time_str: str) -> None:
         """Schedule a single device action."""
@@ -52,85 +81,104 @@ class DeviceScheduler:
                 # If the scheduled time has already passed today, start from tomorrow
                 if today_schedule <= now:
                     logger.info(
-                        f"Schedule {device} {action} at {time_str} has already "
-                        f"passed today, will start from tomorrow"
+                        "Schedule %s %s at %s has already passed today, will start from tomorrow",
+                        device,
+                        action,
+                        time_str,
                     )
             except ValueError:
-                logger.error(f"Invalid time format: {time_str}")
+                logger.error("Invalid time format: %s", time_str)
                 return
 
-            def job() -> None:
-                logger.info(f"Executing scheduled {action} for device '{device}' at {time_str}")
-                if action == "on":
-                    success = gpio_handler.turn_on(device)
-                elif action == "off":
-                    success = gpio_handler.turn_off(device)
-                else:
-                    logger.error(f"Unknown action: {action}")
-                    return
-
-                if success:
-                    logger.info(f"Successfully executed scheduled {action} for " f"device '{device}'")
-                    # Send Discord notification
-                    self._send_discord_notification(device, action, True)
-                else:
-                    logger.error(f"Failed to execute scheduled {action} for device '{device}'")
-                    # Send Discord notification about failure
-                    self._send_discord_notification(device, action, False)
-
             # Schedule the job
-            scheduled_job = schedule.every().day.at(time_str).do(job)
-            self.scheduled_jobs.append(
-                {
-                    "device": device,
-                    "action": action,
-                    "time": time_str,
-                    "job": scheduled_job,
-                }
-            )
-
-            logger.debug(f"Scheduled {action} for device '{device}' at {time_str}")
+            key = (device, action, time_str)
+            previous = self.scheduled_jobs.get(key)
+            if previous is not None:
+                # Re-adding an existing schedule must not make it fire twice
+                schedule.cancel_job(previous.job)
+
+            run_job = functools.partial(self._run_job, device, action, time_str)
+            scheduled_job = schedule.every().day.at(time_str).do(run_job)
+            self.scheduled_jobs[key] = _JobEntry(device, action, time_str, scheduled_job)
+
+            logger.debug("Scheduled %s for device '%s' at %s", action, device, time_str)
+            # The new job may be due before the one the thread is waiting for
+            self._wake.set()
 
         except Exception as e:
-            logger.error(f"Error scheduling {action} for device '{device}' at {time_str}: {e}")
+            logger.error("Error scheduling %s for device '%s' at %s: %s", action, device, time_str, e)
+
+    def _run_job(self, device: str, action: str, time_str: str) -> None:
+        """Run one scheduled device action and report the outcome."""
+        logger.info("Executing scheduled %s for device '%s' at %s", action, device, time_str)
+        if action == "on":
+            success = gpio_handler.turn_on(device)
+        elif action == "off":
+            success = gpio_handler.turn_off(device)
+        else:
+            logger.error("Unknown action: %s", action)
+            return
+
+        if success:
+            logger.info("Successfully executed scheduled %s for device '%s'", action, device)
+            # Send Discord notification
+            self._send_discord_notification(device, action, True)
+        else:
+            logger.error("Failed to execute scheduled %s for device '%s'", action, device)
+            # Send Discord notification about failure
+            self._send_discord_notification(device, action, False)
 
     def add_schedule(self, device: str, action: str, time_str: str) -> bool:
         """Add a new schedule dynamically."""
-        from .config import add_schedule as config_add_schedule
-
-        if config_add_schedule(device, action, time_str):
+        if config.add_schedule(device, action, time_str):
             self._schedule_device_action(device, action, time_str)
-            logger.info(f"Added schedule: {device} {action} at {time_str}")
+            logger.info("Added schedule: %s %s at %s", device, action, time_str)
             return True
         return False
 
     def remove_schedule(self, device: str, action: str, time_str: str) -> bool:
         """Remove a schedule dynamically."""
-        from .config import remove_schedule as config_remove_schedule
-
         # Find and cancel the job
-        for job_info in self.scheduled_jobs[:]:
-            if job_info["device"] == device and job_info["action"] == action and job_info["time"] == time_str:
-                schedule.cancel_job(job_info["job"])
-                self.scheduled_jobs.remove(job_info)
-                logger.info(f"Removed scheduled job: {device} {action} at {time_str}")
-                break
+        job_info = self.scheduled_jobs.pop((device, action, time_str), None)
+        if job_info is not None:
+            schedule.cancel_job(job_info.job)
+            logger.info("Removed scheduled job: %s %s at %s", device, action, time_str)
 
         # Remove from config
-        return config_remove_schedule(device, action, time_str)
+        return config.remove_schedule(device, action, time_str)
+
+    def replace_schedules(self, device: str, entries: Iterable[Tuple[str, str]]) -> Tuple[int, List[Tuple[str, str]]]:
+        """Replace all schedules of a device in one configuration update.
+
+        Args:
+            device: Device name
+            entries: (action, time) pairs to schedule
+
+        Returns:
+            Number of removed schedule entries and the (action, time) pairs added
+        """
+        # Cancel every job of the device in one pass
+        for key in [key for key in self.scheduled_jobs if key[0] == device]:
+            schedule.cancel_job(self.scheduled_jobs.pop(key).job)
+
+        removed_count, added = config.replace_schedules(device, entries)
+        for action, time_str in added:
+            self._schedule_device_action(device, action, time_str)
+
+        logger.info("Replaced schedules for '%s': removed %d, added %d", device, removed_count, len(added))
+        return removed_count, added
 
     def get_next_runs(self) -> list:
         """Get information about next scheduled runs."""
         next_runs = []
-        for job_info in self.scheduled_jobs:
-            job = job_info["job"]
-            next_run = job.next_run
+        for job_info in self.scheduled_jobs.values():
+            next_run = job_info.job.next_run
             if next_run:
                 next_runs.append(
                     {
-                        "device": job_info["device"],
-                        "action": job_info["action"],
-                        "time": job_info["time"],
+                        "device": job_info.device,
+                        "action": job_info.action,
+                        "time": job_info.time,
                         "next_run": next_run.strftime("%Y-%m-%d %H:%M:%S"),
                     }
                 )
@@ -167,9 +215,14 @@ class DeviceScheduler:
         while self.running:
             try:
                 schedule.run_pending()
-                time.sleep(1)
+                # Sleep until the next job is due instead of polling every second
+                delay = schedule.idle_seconds()
+                timeout = _MAX_IDLE_SECONDS if delay is None else min(max(delay, 0), _MAX_IDLE_SECONDS)
             except Exception as e:
-                logger.error(f"Error in scheduler thread: {e}", exc_info=True)
+                logger.error("Error in scheduler thread: %s", e, exc_info=True)
+                timeout = 1
+            self._wake.wait(timeout)
+            self._wake.clear()
 
         logger.debug("Scheduler thread stopped")
 
@@ -181,6 +234,7 @@ class DeviceScheduler:
 
         logger.info("Stopping device scheduler")
         self.running = False
+        self._wake.set()
 
         # Wait for scheduler thread to finish
         if self.scheduler_thread is not None and self.scheduler_thread.is_alive():
@@ -196,55 +250,47 @@ class DeviceScheduler:
         """Send Discord notification for schedule execution."""
         try:
             # Import here to avoid circular imports
-            from .discord.bot import get_bot_instance
-
-            bot = get_bot_instance()
-            logger.info(f"Bot instance available: {bot is not None}")
-            if bot:
-                logger.info(f"Target channel available: {bot.target_channel is not None}")
-
-            if bot and bot.target_channel:
-                if success:
-                    emoji = "💧" if action == "on" else "🛑"
-                    message = f"{emoji} **Scheduled {action.upper()}** - " f"Device '{device}' turned {action.upper()}"
-                else:
-                    message = f"❌ **Schedule Failed** - " f"Could not turn {action} device '{device}'"
-
-                # Use asyncio to send the message via the bot's event loop
-                import asyncio
-
-                def schedule_message() -> None:
-                    """Schedule message to be sent via bot's event loop."""
-                    try:
-                        logger.info(f"Attempting to send message: {message}")
-
-                        # Get the bot's event loop
-                        bot_loop = bot.loop
-                        if bot_loop and not bot_loop.is_closed():
-                            # Schedule the coroutine in the bot's event loop
-                            future = asyncio.run_coroutine_threadsafe(bot.target_channel.send(message), bot_loop)
-                            # Wait for completion with timeout
-                            result = future.result(timeout=10)
-                            logger.info(f"Discord notification sent successfully: {result}")
-                        else:
-                            logger.error("Bot event loop not available")
-                    except Exception as e:
-                        logger.error(f"Failed to send Discord message: {e}", exc_info=True)
-
-                # Run in a separate thread to avoid blocking the scheduler
-                import threading
-
-                thread = threading.Thread(target=schedule_message, daemon=True)
-                thread.start()
-
-                logger.info(f"Queued Discord notification via bot loop: {message}")
-            else:
+            from .discord.bot import WaterBot
+
+            bot = WaterBot.instance()
+            if not bot or not bot.target_channel:
                 logger.warning("Discord bot not available for notifications")
+                return
+
+            if success:
+                emoji = "💧" if action == "on" else "🛑"
+                message = f"{emoji} **Scheduled {action.upper()}** - " f"Device '{device}' turned {action.upper()}"
+            else:
+                message = f"❌ **Schedule Failed** - " f"Could not turn {action} device '{device}'"
+
+            bot_loop = bot.loop
+            if not bot_loop or bot_loop.is_closed():
+                logger.error("Bot event loop not available")
+                return
+
+            # Hand the send to the bot's event loop; the scheduler thread does not
+            # wait for Discord, the outcome is logged when the send completes
+            future = asyncio.run_coroutine_threadsafe(bot.target_channel.send(message), bot_loop)
+            future.add_done_callback(_log_notification_result)
+
+            logger.info("Queued Discord notification via bot loop: %s", message)
         except Exception as e:
-            logger.error(f"Failed to send Discord notification: {e}")
+            logger.error("Failed to send Discord notification: %s", e)
             # Don't raise, as notification failure shouldn't break scheduling
 
 
+def _log_notification_result(future: "concurrent.futures.Future[Any]") -> None:
+    """Log the outcome of a scheduled-job notification sent on the bot's loop."""
+    if future.cancelled():
+        logger.warning("Discord notification was cancelled")
+        return
+    error = future.exception()
+    if error is not None:
+        logger.error("Failed to send Discord message: %s", error, exc_info=error)
+    else:
+        logger.info("Discord notification sent successfully")
+
+
 # Global scheduler instance
 _scheduler = None
 
@@ -281,6 +327,12 @@ def remove_schedule(device: str, action: str, time_str: str) -> bool:
     return scheduler.remove_schedule(device, action, time_str)
 
 
+def replace_schedules(device: str, entries: Iterable[Tuple[str, str]]) -> Tuple[int, List[Tuple[str, str]]]:
+    """Replace all schedules of a device using the global scheduler."""
+    scheduler = get_scheduler()
+    return scheduler.replace_schedules(device, entries)
+
+
 def get_next_runs() -> list:
     """Get next scheduled runs using the global scheduler."""
     scheduler = get_scheduler()
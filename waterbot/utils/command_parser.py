@@ -8,6 +8,39 @@ from ..config import DEVICE_TO_PIN
 
 logger = logging.getLogger("command_parser")
 
+# First word of every recognized command; any other input is answered with help
+# without running the pattern matching below
+_COMMAND_KEYWORDS = frozenset({"status", "test", "time", "ip", "schedule", "schedules", "unschedule", "on", "off"})
+
+# Commands without arguments, resolved with one dict lookup
+_FIXED_COMMANDS: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "status": ("status", {}),
+    "test": ("test", {}),
+    "time": ("time", {}),
+    "ip": ("ip", {}),
+    "on all": ("all_on", {"timeout": 600}),  # 10 minutes in seconds
+    "off all": ("all_off", {"timeout": 600}),  # 10 minutes in seconds
+    "schedules": ("show_schedules", {}),
+    "schedule": ("show_schedules", {}),
+}
+
+# Argument patterns, compiled once at import
+_SCHEDULE_FOR_RE = re.compile(r"(?:schedule|schedules)\s+for\s+(\w+)")
+_SCHEDULE_ADD_RE = re.compile(r"schedule\s+(\w+)\s+(on|off)\s+(\d{2}:\d{2})")
+_SCHEDULE_REMOVE_RE = re.compile(r"unschedule\s+(\w+)\s+(on|off)\s+(\d{2}:\d{2})")
+_ON_RE = re.compile(r"on\s+(\w+)(?:\s+(\d+))?")
+_OFF_RE = re.compile(r"off\s+(\w+)(?:\s+(\d+))?")
+
+
+def _unknown_device(device: str) -> Tuple[str, Dict[str, Any]]:
+    """Build the error result for a device that is not configured."""
+    return "error", {"message": "Unknown device: " + device}
+
+
+def _is_valid_time(time_str: str) -> bool:
+    """Check that a string already matched as HH:MM is a valid time of day."""
+    return int(time_str[:2]) <= 23 and int(time_str[3:]) <= 59
+
 
 def parse_command(text: str) -> Tuple[Optional[str], Dict[str, Any]]:
     """Parse a command string into an action and parameters.
@@ -18,91 +51,68 @@ def parse_command(text: str) -> Tuple[Optional[str], Dict[str, Any]]:
     Returns:
         tuple: (command_type, params) or (None, None) if invalid
     """
-    text = text.strip().lower()
-
-    # Status command
-    if text == "status":
-        return "status", {}
-
-    # Test, time, and ip commands
-    if text == "test":
-        return "test", {}
-
-    if text == "time":
-        return "time", {}
-
-    if text == "ip":
-        return "ip", {}
-
-    # Device-specific schedule query: "schedule for <device>" or "schedules for <device>"
-    schedule_for_match = re.match(r"(?:schedule|schedules)\s+for\s+(\w+)", text)
-    if schedule_for_match:
-        device = schedule_for_match.group(1)
-        if device not in DEVICE_TO_PIN:
-            return "error", {"message": f"Unknown device: {device}"}
-        return "show_device_schedules", {"device": device}
-
-    # Schedule add: "schedule <device> <action> <time>"
-    schedule_add_match = re.match(r"schedule\s+(\w+)\s+(on|off)\s+(\d{2}:\d{2})", text)  # type: ignore[unreachable]
-    if schedule_add_match:
-        device, action, time_str = schedule_add_match.groups()
-        if device not in DEVICE_TO_PIN:
-            return "error", {"message": f"Unknown device: {device}"}
-
-        # Validate time format (HH:MM where HH is 00-23 and MM is 00-59)
-        hour, minute = time_str.split(":")
-        if int(hour) > 23 or int(minute) > 59:
-            return "help", {}  # Invalid time, fall through to help
-
-        return "schedule_add", {"device": device, "action": action, "time": time_str}
-
-    # Schedule remove: "unschedule <device> <action> <time>"
-    schedule_remove_match = re.match(r"unschedule\s+(\w+)\s+(on|off)\s+(\d{2}:\d{2})", text)
-    if schedule_remove_match:
-        device, action, time_str = schedule_remove_match.groups()
-        if device not in DEVICE_TO_PIN:
-            return "error", {"message": f"Unknown device: {device}"}
-
-        # Validate time format (HH:MM where HH is 00-23 and MM is 00-59)
-        hour, minute = time_str.split(":")
-        if int(hour) > 23 or int(minute) > 59:
-            return "help", {}  # Invalid time, fall through to help
-
-        return "schedule_remove", {"device": device, "action": action, "time": time_str}
-
-    # All devices commands
-    if text == "on all":
-        return "all_on", {"timeout": 600}  # 10 minutes in seconds
-
-    if text == "off all":
-        return "all_off", {"timeout": 600}  # 10 minutes in seconds
-
-    # Device-specific commands
-    on_match = re.match(r"on\s+(\w+)(?:\s+(\d+))?", text)
-    if on_match:
-        device, time_str = on_match.groups()
-        if device not in DEVICE_TO_PIN:
-            logger.warning(f"Unknown device: {device}")
-            return "error", {"message": f"Unknown device: {device}"}
-
-        # Use 10 minutes if no timeout specified, convert minutes to seconds
-        timeout = (int(time_str) * 60) if time_str else 600
-        return "device_on", {"device": device, "timeout": timeout}
-
-    off_match = re.match(r"off\s+(\w+)(?:\s+(\d+))?", text)
-    if off_match:
-        device, time_str = off_match.groups()
-        if device not in DEVICE_TO_PIN:
-            logger.warning(f"Unknown device: {device}")
-            return "error", {"message": f"Unknown device: {device}"}
-
-        # Use 10 minutes if no timeout specified, convert minutes to seconds
-        timeout = (int(time_str) * 60) if time_str else 600
-        return "device_off", {"device": device, "timeout": timeout}
-
-    # Simple scheduling commands (must be after more specific schedule patterns)
-    if text == "schedules" or text == "schedule":
-        return "show_schedules", {}
+    text = text.strip()
+    if not text.islower():
+        text = text.lower()
+
+    words = text.split(None, 1)
+    if not words or words[0] not in _COMMAND_KEYWORDS:
+        return "help", {}
+
+    fixed = _FIXED_COMMANDS.get(text)
+    if fixed is not None:
+        command_type, params = fixed
+        return command_type, dict(params)
+
+    keyword = words[0]
+    if keyword == "schedule" or keyword == "schedules":
+        # Device-specific schedule query: "schedule for <device>" or "schedules for <device>"
+        schedule_for_match = _SCHEDULE_FOR_RE.match(text)
+        if schedule_for_match:
+            device = schedule_for_match.group(1)
+            if device not in DEVICE_TO_PIN:
+                return _unknown_device(device)
+            return "show_device_schedules", {"device": device}
+
+        # Schedule add: "schedule <device> <action> <time>"
+        schedule_add_match = _SCHEDULE_ADD_RE.match(text) if keyword == "schedule" else None
+        if schedule_add_match:
+            device, action, time_str = schedule_add_match.groups()
+            if device not in DEVICE_TO_PIN:
+                return _unknown_device(device)
+
+            # Validate time format (HH:MM where HH is 00-23 and MM is 00-59)
+            if not _is_valid_time(time_str):
+                return "help", {}  # Invalid time, fall through to help
+
+            return "schedule_add", {"device": device, "action": action, "time": time_str}
+
+    elif keyword == "unschedule":
+        # Schedule remove: "unschedule <device> <action> <time>"
+        schedule_remove_match = _SCHEDULE_REMOVE_RE.match(text)
+        if schedule_remove_match:
+            device, action, time_str = schedule_remove_match.groups()
+            if device not in DEVICE_TO_PIN:
+                return _unknown_device(device)
+
+            # Validate time format (HH:MM where HH is 00-23 and MM is 00-59)
+            if not _is_valid_time(time_str):
+                return "help", {}  # Invalid time, fall through to help
+
+            return "schedule_remove", {"device": device, "action": action, "time": time_str}
+
+    elif keyword == "on" or keyword == "off":
+        # Device-specific commands: "on <device> [minutes]" or "off <device> [minutes]"
+        device_match = (_ON_RE if keyword == "on" else _OFF_RE).match(text)
+        if device_match:
+            device, time_str = device_match.groups()
+            if device not in DEVICE_TO_PIN:
+                logger.warning("Unknown device: %s", device)
+                return _unknown_device(device)
+
+            # Use 10 minutes if no timeout specified, convert minutes to seconds
+            timeout = (int(time_str) * 60) if time_str else 600
+            return ("device_on" if keyword == "on" else "device_off"), {"device": device, "timeout": timeout}
 
     # Unknown command
     return "help", {}
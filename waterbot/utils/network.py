@@ -0,0 +1,78 @@
+"""Network interface utilities for WaterBot."""
+
+import fcntl
+import logging
+import socket
+import struct
+from typing import Dict, Optional
+
+logger = logging.getLogger("network")
+
+# ioctl request to read an interface's IPv4 address (from <linux/sockios.h>)
+SIOCGIFADDR = 0x8915
+
+# Netlink route protocol and multicast groups (from <linux/rtnetlink.h>)
+NETLINK_ROUTE = 0
+RTMGRP_LINK = 0x1
+RTMGRP_IPV4_IFADDR = 0x10
+
+
+def get_ip_addresses() -> Dict[str, str]:
+    """Get IPv4 addresses for all network interfaces except loopback.
+
+    Addresses are read in-process with one ioctl per interface instead of
+    spawning ``ip addr show`` for each of them.
+
+    Returns:
+        dict: Mapping of interface name to IPv4 address
+    """
+    ip_info: Dict[str, str] = {}
+    try:
+        interfaces = socket.if_nameindex()
+    except OSError:
+        logger.warning("Failed to get network interface information")
+        return ip_info
+
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for _, interface in interfaces:
+            if interface == "lo":
+                continue
+            try:
+                request = struct.pack("256s", interface[:15].encode())
+                result = fcntl.ioctl(sock.fileno(), SIOCGIFADDR, request)
+            except OSError:
+                # Interface is down or has no IPv4 address
+                continue
+
+            ip = socket.inet_ntoa(result[20:24])
+            if ip != "127.0.0.1":
+                ip_info[interface] = ip
+
+    return ip_info
+
+
+def open_address_monitor() -> Optional[socket.socket]:
+    """Open a netlink socket that becomes readable when interface addresses change.
+
+    Returns:
+        socket.socket: Non-blocking netlink route socket, or None if netlink is
+            unavailable on this platform
+    """
+    netlink_family = getattr(socket, "AF_NETLINK", None)
+    if netlink_family is None:
+        return None
+
+    try:
+        sock = socket.socket(netlink_family, socket.SOCK_RAW, NETLINK_ROUTE)
+    except OSError:
+        logger.warning("Failed to open netlink socket for address changes")
+        return None
+
+    try:
+        sock.bind((0, RTMGRP_LINK | RTMGRP_IPV4_IFADDR))
+        sock.setblocking(False)
+    except OSError:
+        logger.warning("Failed to subscribe to netlink address changes")
+        sock.close()
+        return None
+    return sock
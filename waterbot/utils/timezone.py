@@ -0,0 +1,42 @@
+"""System timezone lookup for WaterBot."""
+
+import functools
+import os
+import time
+from typing import Optional
+
+TIMEZONE_FILE = "/etc/timezone"
+LOCALTIME_FILE = "/etc/localtime"
+
+
+@functools.lru_cache(maxsize=None)
+def get_timezone_name() -> Optional[str]:
+    """Get the system timezone name.
+
+    The timezone is read from the system configuration files once and cached,
+    since it does not change while the bot runs.
+
+    Returns:
+        str: IANA timezone name (e.g. "Europe/Berlin") or the C library
+            abbreviation if no name is configured, or None if unknown
+    """
+    try:
+        with open(TIMEZONE_FILE) as f:
+            name = f.read().strip()
+        if name:
+            return name
+    except OSError:
+        pass
+
+    # /etc/localtime is usually a symlink into the zoneinfo database
+    try:
+        target = os.path.realpath(LOCALTIME_FILE)
+    except OSError:
+        target = ""
+    if "zoneinfo/" in target:
+        return target.split("zoneinfo/", 1)[1]
+
+    try:
+        return time.tzname[time.daylight]
+    except Exception:
+        return None